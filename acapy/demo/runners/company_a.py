@@ -1,15 +1,22 @@
 #!/usr/bin/env python3
 import asyncio
-import datetime
+import io
 import json
 import logging
 import os
+import re
 import sys
 import time
-from aiohttp import ClientError
+from array import array
+from aiohttp import ClientError, ClientSession, TCPConnector
 from aiohttp import web
 from qrcode import QRCode
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from runners.agent_container import (  # noqa:E402
@@ -32,9 +39,168 @@ from runners.support.utils import (  # noqa:E402
 SELF_ATTESTED = os.getenv("SELF_ATTESTED")
 DEMO_EXTRA_AGENT_ARGS = os.getenv("DEMO_EXTRA_AGENT_ARGS")
 
+# Hard cap on tracked holder connections; the oldest row is dropped when
+# the cap is reached so long-running verifiers cannot grow without bound
+HOLDER_CAP = int(os.getenv("HOLDER_CAP", "10000"))
+
 logging.basicConfig(level=logging.WARNING)
 LOGGER = logging.getLogger(__name__)
 
+class TTLBoundedCache(dict):
+    """Dict with a max size and per-entry TTL, evicted lazily on insert.
+
+    Keeps verified-proof retention bounded instead of growing for the
+    lifetime of the process. Eviction runs every EVICTION_INTERVAL inserts
+    (or when full) so the cost is amortized across a batch of inserts.
+    """
+
+    EVICTION_INTERVAL = 64
+
+    def __init__(self, maxsize=10_000, ttl=300.0):
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._expires = {}
+        self._ticks = 0
+
+    def __setitem__(self, key, value):
+        self._ticks += 1
+        if self._ticks >= self.EVICTION_INTERVAL or len(self) >= self.maxsize:
+            self._evict()
+            self._ticks = 0
+        super().__setitem__(key, value)
+        self._expires[key] = time.time() + self.ttl
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._expires.pop(key, None)
+
+    def _evict(self):
+        now = time.time()
+        for key in [k for k, exp in self._expires.items() if exp <= now]:
+            del self[key]
+        # Still full of live entries: drop oldest inserts first
+        while len(self) >= self.maxsize:
+            del self[next(iter(self))]
+
+
+# One row of the holder listing rendered by a single pre-bound format call
+_HOLDER_ROW_TPL = (
+    "  • {} ({})\n"
+    "    Connected: {}\n"
+    "    Proofs Requested: {}\n"
+    "    Proofs Verified: {}"
+).format
+
+# Compiled once: splits comma-separated attribute input and strips the
+# surrounding whitespace in the same pass
+_ATTR_SPLIT = re.compile(r"\s*,\s*")
+
+DEFAULT_GENERIC_SCHEMA = "university registration schema"
+DEFAULT_GENERIC_ATTRS = ("student_name", "university_name", "graduation_year")
+
+# One restrictions list shared by reference across every req_attr below;
+# it is never mutated, so there is no need to allocate a fresh copy per
+# attribute
+UNIV_RESTRICTIONS = [{"schema_name": "university_registration_schema"}]
+
+def _timestamp_str(ts):
+    """Format an epoch timestamp for display without importing datetime"""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+
+
+def log_lines(lines):
+    """Write a batch of display lines as one terminal update"""
+    if lines:
+        log_msg("\n".join(lines))
+
+
+def _format_revealed_attrs(revealed_attrs, indent="   "):
+    """Format revealed attributes as display lines in one comprehension"""
+    return [
+        f"{indent}{attr_name}: {attr_data.get('raw', 'N/A')}"
+        for attr_name, attr_data in revealed_attrs.items()
+    ]
+
+
+def _render_qr_ascii(url):
+    """Render a QR code for url to an ASCII string (CPU-bound, run off-loop)"""
+    qr = QRCode(border=1)
+    qr.add_data(url)
+    out = io.StringIO()
+    qr.print_ascii(out=out, invert=True)
+    return out.getvalue()
+
+
+# Pre-formatted "0_<name>_uuid" keys for the university proof request,
+# matching the schema used by uni_reg_a and uni_admin_a. Computing these
+# once avoids an f-string format plus re-hashing per attribute on every send
+UNIV_ATTR_PAIRS = tuple(
+    (
+        f"0_{name}_uuid",
+        {
+            "name": name,
+            "restrictions": UNIV_RESTRICTIONS,
+        },
+    )
+    for name in ("student_id", "student_name", "university_name", "graduation_year")
+)
+
+# The JSON-LD presentation request is entirely static, so build it once at
+# import time and treat it as frozen: every agent instance and every send
+# shares this one structure, and nothing downstream may mutate it
+UNIV_JSONLD_PRESENTATION_REQUEST = {
+    "dif": {
+        "options": {
+            "challenge": "3fa85f64-5717-4562-b3fc-2c963f66afa7",
+            "domain": "4jt78h47fh47",
+        },
+        "presentation_definition": {
+            "id": "32f54163-7166-48f1-93d8-ff217bdb0654",
+            "format": {"ldp_vp": {"proof_type": [SIG_TYPE_BLS]}},
+            "input_descriptors": [
+                {
+                    "id": "university_input_1",
+                    "name": "University Student Credential",
+                    "schema": [
+                        {
+                            "uri": "https://www.w3.org/2018/credentials#VerifiableCredential"
+                        },
+                        {
+                            "uri": "https://w3id.org/citizenship#UniversityStudent"
+                        },
+                    ],
+                    "constraints": {
+                        "limit_disclosure": "required",
+                        "fields": [
+                            {
+                                "path": ["$.credentialSubject.givenName"],
+                                "purpose": "We need your first name"
+                            },
+                            {
+                                "path": ["$.credentialSubject.familyName"],
+                                "purpose": "We need your last name"
+                            },
+                            {
+                                "path": ["$.credentialSubject.universityName"],
+                                "purpose": "We need your university name"
+                            },
+                            {
+                                "path": ["$.credentialSubject.graduationYear"],
+                                "purpose": "We need your graduation year"
+                            },
+                            {
+                                "path": ["$.credentialSubject.cgpa"],
+                                "purpose": "We need your CGPA"
+                            }
+                        ],
+                    },
+                }
+            ],
+        },
+    }
+}
+
 
 class CompanyAAgent(AriesAgent):
     def __init__(
@@ -65,11 +231,99 @@ class CompanyAAgent(AriesAgent):
             log_level=log_level,
             **kwargs,
         )
-        self.holder_connections = {}  # Store multiple holder connections
+        # Holder connections are stored column-wise (structure-of-arrays)
+        # rather than as a dict of per-connection dicts: stat bumps become
+        # plain list-index updates and the listings walk contiguous arrays
+        # instead of chasing a dict per field per row
+        # The numeric columns are typed arrays: unboxed machine ints and
+        # doubles instead of one Python object per counter
+        self._conn_ids = []
+        self._conn_aliases = []
+        self._connected_at = array("d")
+        self._connected_at_str = []  # display string, formatted once at insert
+        self._proofs_requested = array("I")
+        self._proofs_verified = array("I")
+        self._conn_index = {}  # connection_id -> row index
+        self._conn_ids_snapshot = ()  # cached tuple handed out by listings
+
+        # Running totals maintained on each bump so the statistics view is
+        # O(1) instead of summing the per-connection columns
+        self._total_proofs_requested = 0
+        self._total_proofs_verified = 0
+
+        # Timing stats change slowly; a short TTL absorbs repeated fetches
+        # without going back to the admin API each time
+        self._timing_cache = None
+        self._timing_cached_at = 0.0
+
+        # Replace the default admin session with one whose connector keeps
+        # idle connections to the admin API warm, so repeated proof-request
+        # POSTs reuse sockets instead of re-handshaking under load
+        old_session = self.client_session
+        self.client_session = ClientSession(
+            connector=TCPConnector(limit=100, keepalive_timeout=60)
+        )
+        asyncio.get_event_loop().create_task(old_session.close())
+
         self.proof_requests = {}  # Store sent proof requests
-        self.verified_proofs = {}  # Store verified proofs
+        self.verified_proofs = TTLBoundedCache()  # Recently verified proofs
         self._connection_ready = None
 
+        # Coarse once-per-second clock: proof-request builds and connection
+        # bookkeeping only need second resolution, so read this instead of
+        # hitting clock_gettime on every call
+        self._coarse_now = int(time.time())
+        self._clock_task = asyncio.get_event_loop().create_task(self._tick())
+
+        # Bursts of present-proof webhooks are absorbed by a bounded queue
+        # and drained by a single consumer task that batches the state
+        # updates and log output instead of handling one event at a time
+        self._proof_events = asyncio.Queue(maxsize=1024)
+        self._proof_consumer = asyncio.get_event_loop().create_task(
+            self._drain_proof_events()
+        )
+
+        # The proof requests are identical on every call apart from
+        # trace/connection_id and the revocation timestamp, so build the
+        # skeletons once and patch shallow copies per request instead of
+        # re-allocating ~20 dicts/lists each time
+        self._univ_tmpl_aip10 = self._build_univ_indy_template()
+        self._univ_tmpl_aip20_indy = self._build_univ_indy_template()
+        self._univ_tmpl_jsonld = UNIV_JSONLD_PRESENTATION_REQUEST
+
+        # (aip, cred_type) -> bound builder; dispatch is one dict lookup.
+        # AIP 1.0 always sends the indy format, so both cred types map to
+        # the same builder there
+        self._univ_builders = {
+            (10, CRED_FORMAT_INDY): self._build_univ_aip10,
+            (10, CRED_FORMAT_JSON_LD): self._build_univ_aip10,
+            (20, CRED_FORMAT_INDY): self._build_univ_aip20_indy,
+            (20, CRED_FORMAT_JSON_LD): self._build_univ_aip20_jsonld,
+        }
+
+    def _build_univ_indy_template(self):
+        """Build the static indy proof request skeleton for university credentials"""
+        requested_attributes = dict(UNIV_ATTR_PAIRS)
+
+        if SELF_ATTESTED:
+            requested_attributes["0_self_attested_thing_uuid"] = {
+                "name": "self_attested_thing"
+            }
+
+        # No predicates needed for basic verification
+        return {
+            "name": "Company A - University Credential Verification",
+            "version": "1.0",
+            "requested_attributes": requested_attributes,
+            "requested_predicates": {},
+        }
+
+    async def _tick(self):
+        """Refresh the coarse clock once per second"""
+        while True:
+            self._coarse_now = int(time.time())
+            await asyncio.sleep(1.0)
+
     async def detect_connection(self):
         await self._connection_ready
         self._connection_ready = None
@@ -78,19 +332,129 @@ class CompanyAAgent(AriesAgent):
     def connection_ready(self):
         return self._connection_ready.done() and self._connection_ready.result()
 
+    async def admin_request(
+        self, method, path, data=None, text=False, params=None, headers=None
+    ):
+        if orjson is None:
+            return await super().admin_request(
+                method, path, data=data, text=text, params=params, headers=headers
+            )
+        # Serialize the (large) proof-request bodies with orjson and parse
+        # response bytes directly, bypassing stdlib json in both directions
+        params = {k: v for (k, v) in (params or {}).items() if v is not None}
+        headers = dict(headers) if headers else {}
+        if data is not None:
+            headers["Content-Type"] = "application/json"
+        async with self.client_session.request(
+            method,
+            self.admin_url + path,
+            data=orjson.dumps(data) if data is not None else None,
+            params=params,
+            headers=headers,
+        ) as resp:
+            resp_body = await resp.read()
+            try:
+                resp.raise_for_status()
+            except Exception as e:
+                # try to retrieve and print text on error
+                raise Exception(f"Error: {resp_body.decode(errors='replace')}") from e
+            if not resp_body and not text:
+                return None
+            if not text:
+                try:
+                    return orjson.loads(resp_body)
+                except orjson.JSONDecodeError as e:
+                    raise Exception(f"Error decoding JSON: {resp_body}") from e
+            return resp_body.decode()
+
+    TIMING_CACHE_TTL = 2.0
+
+    async def fetch_timing(self):
+        """Fetch timing stats from the admin API, cached for a couple seconds"""
+        now = time.monotonic()
+        if (
+            self._timing_cache is not None
+            and now - self._timing_cached_at < self.TIMING_CACHE_TTL
+        ):
+            return self._timing_cache
+        timing = await super().fetch_timing()
+        self._timing_cache = timing
+        self._timing_cached_at = now
+        return timing
+
     def add_holder_connection(self, connection_id, alias=None):
         """Add a new holder connection"""
-        self.holder_connections[connection_id] = {
-            "alias": alias or f"Holder-{connection_id[:8]}",
-            "connected_at": time.time(),
-            "proofs_requested": 0,
-            "proofs_verified": 0
-        }
-        log_msg(f"✅ Added holder connection: {connection_id} ({self.holder_connections[connection_id]['alias']})")
+        alias = alias or f"Holder-{connection_id[:8]}"
+        if connection_id in self._conn_index:
+            self._conn_aliases[self._conn_index[connection_id]] = alias
+        else:
+            if len(self._conn_ids) >= HOLDER_CAP:
+                evicted = self._evict_oldest_holder()
+                log_msg(
+                    f"⚠️ Holder cap {HOLDER_CAP} reached, dropped oldest"
+                    f" connection {evicted}"
+                )
+            self._conn_index[connection_id] = len(self._conn_ids)
+            self._conn_ids.append(connection_id)
+            self._conn_aliases.append(alias)
+            self._connected_at.append(self._coarse_now)
+            self._connected_at_str.append(_timestamp_str(self._coarse_now))
+            self._proofs_requested.append(0)
+            self._proofs_verified.append(0)
+            self._conn_ids_snapshot = tuple(self._conn_ids)
+        log_msg(f"✅ Added holder connection: {connection_id} ({alias})")
+
+    def _evict_oldest_holder(self):
+        """Drop the oldest holder row from every column; returns its id"""
+        oldest = self._conn_ids.pop(0)
+        del self._conn_index[oldest]
+        self._conn_aliases.pop(0)
+        self._connected_at.pop(0)
+        self._connected_at_str.pop(0)
+        self._proofs_requested.pop(0)
+        self._proofs_verified.pop(0)
+        # Every surviving row shifted down one slot
+        for key in self._conn_index:
+            self._conn_index[key] -= 1
+        return oldest
 
     def get_holder_connections(self):
-        """Get all holder connections"""
-        return list(self.holder_connections.keys())
+        """Get all holder connection ids (cached, rebuilt only on add)"""
+        return self._conn_ids_snapshot
+
+    def holder_count(self):
+        """Get the number of holder connections"""
+        return len(self._conn_ids)
+
+    def conn_alias(self, connection_id):
+        """Get the display alias for a holder connection"""
+        return self._conn_aliases[self._conn_index[connection_id]]
+
+    def bump_proofs_requested(self, connection_id):
+        """Count a proof request sent to a holder connection"""
+        if connection_id in self._conn_index:
+            self._proofs_requested[self._conn_index[connection_id]] += 1
+            self._total_proofs_requested += 1
+
+    def bump_proofs_verified(self, connection_id):
+        """Count a proof verified for a holder connection"""
+        if connection_id in self._conn_index:
+            self._proofs_verified[self._conn_index[connection_id]] += 1
+            self._total_proofs_verified += 1
+
+    def iter_holder_stats(self):
+        """Iterate (connection_id, alias, connected str, requested, verified) rows"""
+        return zip(
+            self._conn_ids,
+            self._conn_aliases,
+            self._connected_at_str,
+            self._proofs_requested,
+            self._proofs_verified,
+        )
+
+    def proof_totals(self):
+        """Get (total proofs requested, total proofs verified) across holders"""
+        return self._total_proofs_requested, self._total_proofs_verified
 
     async def handle_connections(self, payload):
         """Handle connection state changes"""
@@ -100,260 +464,171 @@ class CompanyAAgent(AriesAgent):
         log_msg(f"Connection {conn_id} state: {state}")
         
         if state == "active" and conn_id:
-            try:
-                # Get connection info
-                connection_info = await self.admin_GET(f"/connections/{conn_id}")
-                their_label = connection_info.get("their_label", "")
-                alias = connection_info.get("alias", f"Holder-{conn_id[:8]}")
-                
-                # Add this as a holder connection (Company A only connects to holders)
-                self.add_holder_connection(conn_id, alias)
-                
-                log_msg(f"🏢 Company A connected to holder: {conn_id} ({alias})")
-                
-            except Exception as e:
-                # Fallback - still add the connection
-                self.add_holder_connection(conn_id)
-                log_msg(f"Could not get connection details, but added connection: {e}")
+            # The connections webhook payload is the connection record, so
+            # the alias is usually already in hand; only fall back to an
+            # admin GET when the payload has neither alias nor label
+            alias = payload.get("alias") or payload.get("their_label")
+            if not alias:
+                try:
+                    connection_info = await self.admin_GET(f"/connections/{conn_id}")
+                    alias = connection_info.get("alias") or connection_info.get(
+                        "their_label"
+                    )
+                except Exception as e:
+                    log_msg(f"Could not get connection details: {e}")
+
+            # Add this as a holder connection (Company A only connects to holders)
+            self.add_holder_connection(conn_id, alias)
+
+            log_msg(
+                f"🏢 Company A connected to holder: {conn_id}"
+                f" ({alias or f'Holder-{conn_id[:8]}'})"
+            )
 
     async def handle_present_proof(self, payload):
-        """Handle present proof webhook events"""
+        """Queue present proof webhook events for batched processing"""
+        await self._proof_events.put(payload)
+
+    async def _drain_proof_events(self):
+        """Drain queued proof events, batching state updates and log output"""
+        while True:
+            batch = [await self._proof_events.get()]
+            # Pick up whatever else arrived while we were waiting
+            while len(batch) < 64:
+                try:
+                    batch.append(self._proof_events.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            lines = []
+            for payload in batch:
+                try:
+                    self._apply_proof_event(payload, lines)
+                except Exception as e:
+                    lines.append(f"❌ Error processing proof event: {e}")
+            log_lines(lines)
+
+    def _apply_proof_event(self, payload, lines):
+        """Apply a single present proof event, collecting display output in lines"""
         presentation_exchange_id = payload.get("presentation_exchange_id")
         state = payload.get("state")
         connection_id = payload.get("connection_id")
-        
-        log_msg(f"📋 Proof exchange {presentation_exchange_id} state: {state}")
-        
+
+        lines.append(f"📋 Proof exchange {presentation_exchange_id} state: {state}")
+
         if state == "presentation_received":
             # Proof received, automatically verify it
-            log_msg("🔍 Proof received, verifying...")
-            
+            lines.append("🔍 Proof received, verifying...")
+
         elif state == "verified":
             # Proof verified successfully
             presentation = payload.get("presentation", {})
-            
-            # Store verified proof
+            requested_proof = presentation.get("requested_proof", {})
+            revealed_attrs = requested_proof.get("revealed_attrs", {})
+            predicates = requested_proof.get("predicates", {})
+
+            # Store only what the listing needs, not the full presentation
+            # payload: the attribute display lines are formatted here, once,
+            # so option 6 just extends them into its output
+            now = time.time()
             self.verified_proofs[presentation_exchange_id] = {
                 "connection_id": connection_id,
-                "verified_at": time.time(),
-                "presentation": presentation
+                "verified_at": now,
+                "verified_at_str": _timestamp_str(now),
+                "revealed_lines": _format_revealed_attrs(
+                    revealed_attrs, indent="      "
+                ),
             }
-            
+
             # Update connection stats
-            if connection_id in self.holder_connections:
-                self.holder_connections[connection_id]["proofs_verified"] += 1
-            
-            log_msg("✅ PROOF VERIFICATION SUCCESSFUL!")
-            log_msg("=" * 50)
-            
+            self.bump_proofs_verified(connection_id)
+
+            lines.append("✅ PROOF VERIFICATION SUCCESSFUL!")
+            lines.append("=" * 50)
+
             # Extract and display credential information
-            if "requested_proof" in presentation:
-                revealed_attrs = presentation["requested_proof"].get("revealed_attrs", {})
-                log_msg("📋 Verified Credential Information:")
-                for attr_name, attr_data in revealed_attrs.items():
-                    log_msg(f"   {attr_name}: {attr_data.get('raw', 'N/A')}")
-                
+            if requested_proof:
+                lines.append("📋 Verified Credential Information:")
+                lines.extend(_format_revealed_attrs(revealed_attrs))
+
                 # Check predicates
-                predicates = presentation["requested_proof"].get("predicates", {})
                 if predicates:
-                    log_msg("🔢 Verified Predicates:")
+                    lines.append("🔢 Verified Predicates:")
                     for pred_name in predicates:
-                        log_msg(f"   {pred_name}: ✅ SATISFIED")
-            
-            log_msg("=" * 50)
-            
+                        lines.append(f"   {pred_name}: ✅ SATISFIED")
+
+            lines.append("=" * 50)
+
         elif state == "presentation_acked":
-            log_msg("📨 Proof verification acknowledged by holder")
+            lines.append("📨 Proof verification acknowledged by holder")
+
+    def _build_univ_aip10(self, revocation, exchange_tracing):
+        """Build the AIP 1.0 university proof request body"""
+        indy_proof_request = {**self._univ_tmpl_aip10}
+
+        if revocation:
+            indy_proof_request["non_revoked"] = {"to": self._coarse_now}
+
+        return {
+            "proof_request": indy_proof_request,
+            "trace": exchange_tracing,
+        }
+
+    def _build_univ_aip20_indy(self, revocation, exchange_tracing):
+        """Build the AIP 2.0 indy university proof request body"""
+        indy_proof_request = {**self._univ_tmpl_aip20_indy}
+
+        if revocation:
+            indy_proof_request["non_revoked"] = {"to": self._coarse_now}
+
+        return {
+            "presentation_request": {"indy": indy_proof_request},
+            "trace": exchange_tracing,
+        }
+
+    def _build_univ_aip20_jsonld(self, revocation, exchange_tracing):
+        """Build the AIP 2.0 JSON-LD university proof request body
+
+        The request body is entirely static, so the template sub-tree is
+        shared by reference (it is never mutated downstream).
+        """
+        return {
+            "comment": "Company A verification request for university registration json-ld",
+            "presentation_request": self._univ_tmpl_jsonld,
+        }
 
     def generate_university_proof_request(self, aip, cred_type, revocation, exchange_tracing, connection_id=None, connectionless=False):
         """Generate proof request for university credentials"""
-        
-        if aip == 10:
-            # AIP 1.0 format
-            # Use attributes that match the schema used by uni_reg_a and uni_admin_a
-            req_attrs = [
-                {
-                    "name": "student_id",
-                    "restrictions": [{"schema_name": "university_registration_schema"}],
-                },
-                {
-                    "name": "student_name",
-                    "restrictions": [{"schema_name": "university_registration_schema"}],
-                },
-                {
-                    "name": "university_name",
-                    "restrictions": [{"schema_name": "university_registration_schema"}],
-                },
-                {
-                    "name": "graduation_year",
-                    "restrictions": [{"schema_name": "university_registration_schema"}],
-                },
-            ]
-            
-            if SELF_ATTESTED:
-                req_attrs.append({"name": "self_attested_thing"})
-            
-            # No predicates needed for basic verification
-            req_preds = []
-            
-            indy_proof_request = {
-                "name": "Company A - University Credential Verification",
-                "version": "1.0",
-                "requested_attributes": {
-                    f"0_{req_attr['name']}_uuid": req_attr for req_attr in req_attrs
-                },
-                "requested_predicates": {
-                    f"0_{req_pred['name']}_GE_uuid": req_pred for req_pred in req_preds
-                },
-            }
-            
-            if revocation:
-                indy_proof_request["non_revoked"] = {"to": int(time.time())}
-            
-            proof_request = {
-                "proof_request": indy_proof_request,
-                "trace": exchange_tracing,
-            }
-            
-            if not connectionless and connection_id:
-                proof_request["connection_id"] = connection_id
-                
-            return proof_request
-            
-        elif aip == 20:
-            if cred_type == CRED_FORMAT_INDY:
-                # AIP 2.0 Indy format
-                req_attrs = [
-                {
-                    "name": "student_id",
-                    "restrictions": [{"schema_name": "university_registration_schema"}],
-                },
-                {
-                    "name": "student_name",
-                    "restrictions": [{"schema_name": "university_registration_schema"}],
-                },
-                {
-                    "name": "university_name",
-                    "restrictions": [{"schema_name": "university_registration_schema"}],
-                },
-                {
-                    "name": "graduation_year",
-                    "restrictions": [{"schema_name": "university_registration_schema"}],
-                },
-            ]
-                
-                if SELF_ATTESTED:
-                    req_attrs.append({"name": "self_attested_thing"})
-                
-                # No predicates needed for this verification
-                req_preds = []
-                
-                indy_proof_request = {
-                    "name": "Company A - University Credential Verification",
-                    "version": "1.0", 
-                    "requested_attributes": {
-                        f"0_{req_attr['name']}_uuid": req_attr for req_attr in req_attrs
-                    },
-                    "requested_predicates": {
-                        f"0_{req_pred['name']}_GE_uuid": req_pred for req_pred in req_preds
-                    },
-                }
-                
-                if revocation:
-                    indy_proof_request["non_revoked"] = {"to": int(time.time())}
-                
-                proof_request = {
-                    "presentation_request": {"indy": indy_proof_request},
-                    "trace": exchange_tracing,
-                }
-                
-                if not connectionless and connection_id:
-                    proof_request["connection_id"] = connection_id
-                    
-                return proof_request
-                
-            elif cred_type == CRED_FORMAT_JSON_LD:
-                # AIP 2.0 JSON-LD format
-                proof_request = {
-                    "comment": "Company A verification request for university registration json-ld",
-                    "presentation_request": {
-                        "dif": {
-                            "options": {
-                                "challenge": "3fa85f64-5717-4562-b3fc-2c963f66afa7",
-                                "domain": "4jt78h47fh47",
-                            },
-                            "presentation_definition": {
-                                "id": "32f54163-7166-48f1-93d8-ff217bdb0654",
-                                "format": {"ldp_vp": {"proof_type": [SIG_TYPE_BLS]}},
-                                "input_descriptors": [
-                                    {
-                                        "id": "university_input_1",
-                                        "name": "University Student Credential",
-                                        "schema": [
-                                            {
-                                                "uri": "https://www.w3.org/2018/credentials#VerifiableCredential"
-                                            },
-                                            {
-                                                "uri": "https://w3id.org/citizenship#UniversityStudent"
-                                            },
-                                        ],
-                                        "constraints": {
-                                            "limit_disclosure": "required",
-                                            "fields": [
-                                                {
-                                                    "path": ["$.credentialSubject.givenName"],
-                                                    "purpose": "We need your first name"
-                                                },
-                                                {
-                                                    "path": ["$.credentialSubject.familyName"],
-                                                    "purpose": "We need your last name"
-                                                },
-                                                {
-                                                    "path": ["$.credentialSubject.universityName"],
-                                                    "purpose": "We need your university name"
-                                                },
-                                                {
-                                                    "path": ["$.credentialSubject.graduationYear"],
-                                                    "purpose": "We need your graduation year"
-                                                },
-                                                {
-                                                    "path": ["$.credentialSubject.cgpa"],
-                                                    "purpose": "We need your CGPA"
-                                                }
-                                            ],
-                                        },
-                                    }
-                                ],
-                            },
-                        }
-                    },
-                }
-                
-                if not connectionless and connection_id:
-                    proof_request["connection_id"] = connection_id
-                    
-                return proof_request
-                
-            else:
-                raise Exception(f"Error invalid credential type: {cred_type}")
-        else:
-            raise Exception(f"Error invalid AIP level: {aip}")
+        builder = self._univ_builders.get((aip, cred_type))
+        if builder is None:
+            if aip not in (10, 20):
+                raise Exception(f"Error invalid AIP level: {aip}")
+            raise Exception(f"Error invalid credential type: {cred_type}")
+
+        proof_request = builder(revocation, exchange_tracing)
+
+        if not connectionless and connection_id:
+            proof_request["connection_id"] = connection_id
+
+        return proof_request
 
     def generate_generic_proof_request(self, aip, cred_type, exchange_tracing, connection_id=None, schema_name=None, attributes=None):
         """Generate a generic proof request for any schema"""
         
         if not schema_name:
-            schema_name = "university registration schema"  # default
-            
+            schema_name = DEFAULT_GENERIC_SCHEMA
+
         if not attributes:
-            attributes = ["student_name", "student_id"]  # default attributes
+            attributes = DEFAULT_GENERIC_ATTRS
         
         if aip == 20 and cred_type == CRED_FORMAT_INDY:
+            # All attributes share the same restrictions list by reference
+            restrictions = [{"schema_name": schema_name}]
             req_attrs = []
             for attr in attributes:
                 req_attrs.append({
                     "name": attr,
-                    "restrictions": [{"schema_name": schema_name}],
+                    "restrictions": restrictions,
                 })
             
             indy_proof_request = {
@@ -406,6 +681,11 @@ async def main(args):
         extra_args=extra_args,
     )
 
+    # Fire-and-forget work (e.g. invitation generation) is tracked here so
+    # it can be awaited before shutdown; the done callback keeps the set
+    # from accumulating finished tasks
+    background_tasks = set()
+
     try:
         log_status(
             "#1 Provision Company A agent and wallet - VERIFIER ONLY"
@@ -447,20 +727,59 @@ async def main(args):
         await company_a_agent.initialize(the_agent=agent)
 
         log_msg("🏢 Company A Agent initialized successfully as VERIFIER ONLY")
-        
+
+        # These container attributes never change after initialization, so
+        # bind them once instead of re-resolving them on every menu pass
+        _aip = company_a_agent.aip
+        _cred_type = company_a_agent.cred_type
+        _revocation = company_a_agent.revocation
+        _reuse = company_a_agent.reuse_connections
+        _multi_use = company_a_agent.multi_use_invitations
+        _public_did = company_a_agent.public_did_connections
+
         # Generate invitation for holders to connect
         await company_a_agent.generate_invitation(
             display_qr=True,
-            reuse_connections=company_a_agent.reuse_connections,
-            multi_use_invitations=company_a_agent.multi_use_invitations,
-            public_did_connections=company_a_agent.public_did_connections,
+            reuse_connections=_reuse,
+            multi_use_invitations=_multi_use,
+            public_did_connections=_public_did,
             wait=False,
         )
 
         log_msg("🏢 Company A ready to verify credentials from any issuer")
         
         exchange_tracing = False
-        
+
+        def spawn_background(coro):
+            task = asyncio.get_event_loop().create_task(coro)
+            background_tasks.add(task)
+            task.add_done_callback(background_tasks.discard)
+            return task
+
+        async def pick_holder_connection():
+            """List holder connections and prompt for one; None if unavailable"""
+            holder_connections = agent.get_holder_connections()
+            if not holder_connections:
+                log_msg("❌ No holder connections available.")
+                return None
+            log_msg(
+                "Available holder connections:\n"
+                + "\n".join(
+                    f"  {i}. {conn_id} ({agent.conn_alias(conn_id)})"
+                    for i, conn_id in enumerate(holder_connections, 1)
+                )
+            )
+            if len(holder_connections) == 1:
+                return holder_connections[0]
+            selection = await prompt(
+                f"Select connection (1-{len(holder_connections)}): "
+            )
+            try:
+                return holder_connections[int(selection) - 1]
+            except (ValueError, IndexError):
+                log_msg("Invalid selection")
+                return None
+
         options = (
             "    (1) Send University Credential Proof Request\n"
             "    (2) Send Generic Proof Request\n"
@@ -479,297 +798,279 @@ async def main(args):
             "W/" if company_a_agent.multitenant else "",
         )
 
-        async for option in prompt_loop(options):
-            if option is not None:
-                option = option.strip()
+        async def option_create_wallet():
+            target_wallet_name = await prompt("Enter wallet name: ")
+            include_subwallet_webhook = await prompt(
+                "(Y/N) Create sub-wallet webhook target: "
+            )
+            if include_subwallet_webhook.lower() == "y":
+                await company_a_agent.agent.register_or_switch_wallet(
+                    target_wallet_name,
+                    webhook_port=company_a_agent.agent.get_new_webhook_port(),
+                    public_did=False,  # Verifier doesn't need public DID
+                    mediator_agent=company_a_agent.mediator_agent,
+                    endorser_agent=company_a_agent.endorser_agent,
+                    taa_accept=company_a_agent.taa_accept,
+                )
+            else:
+                await company_a_agent.agent.register_or_switch_wallet(
+                    target_wallet_name,
+                    public_did=False,
+                    mediator_agent=company_a_agent.mediator_agent,
+                    endorser_agent=company_a_agent.endorser_agent,
+                    cred_type=company_a_agent.cred_type,
+                    taa_accept=company_a_agent.taa_accept,
+                )
 
-            if option is None or option in "xX":
-                break
+        async def option_toggle_tracing():
+            nonlocal exchange_tracing
+            exchange_tracing = not exchange_tracing
+            log_msg(
+                ">>> Proof Exchange Tracing is {}".format(
+                    "ON" if exchange_tracing else "OFF"
+                )
+            )
+
+        async def option_univ_proof():
+            log_status("#20 Send University Credential Proof Request")
+            selected_conn = await pick_holder_connection()
+            if not selected_conn:
+                return
 
-            elif option in "wW" and company_a_agent.multitenant:
-                target_wallet_name = await prompt("Enter wallet name: ")
-                include_subwallet_webhook = await prompt(
-                    "(Y/N) Create sub-wallet webhook target: "
+            # Generate and send proof request
+            try:
+                proof_request = agent.generate_university_proof_request(
+                    _aip,
+                    _cred_type,
+                    _revocation,
+                    exchange_tracing,
+                    connection_id=selected_conn
                 )
-                if include_subwallet_webhook.lower() == "y":
-                    created = await company_a_agent.agent.register_or_switch_wallet(
-                        target_wallet_name,
-                        webhook_port=company_a_agent.agent.get_new_webhook_port(),
-                        public_did=False,  # Verifier doesn't need public DID
-                        mediator_agent=company_a_agent.mediator_agent,
-                        endorser_agent=company_a_agent.endorser_agent,
-                        taa_accept=company_a_agent.taa_accept,
-                    )
-                else:
-                    created = await company_a_agent.agent.register_or_switch_wallet(
-                        target_wallet_name,
-                        public_did=False,
-                        mediator_agent=company_a_agent.mediator_agent,
-                        endorser_agent=company_a_agent.endorser_agent,
-                        cred_type=company_a_agent.cred_type,
-                        taa_accept=company_a_agent.taa_accept,
-                    )
 
-            elif option in "tT":
-                exchange_tracing = not exchange_tracing
-                log_msg(
-                    ">>> Proof Exchange Tracing is {}".format(
-                        "ON" if exchange_tracing else "OFF"
-                    )
+                # Update connection stats
+                agent.bump_proofs_requested(selected_conn)
+
+                if _aip == 10:
+                    await agent.admin_POST("/present-proof/send-request", proof_request)
+                elif _aip == 20:
+                    await agent.admin_POST("/present-proof-2.0/send-request", proof_request)
+
+                log_msg(f"📤 University credential proof request sent to {selected_conn}")
+
+            except Exception as e:
+                log_msg(f"❌ Error sending proof request: {e}")
+
+        async def option_generic_proof():
+            log_status("#21 Send Generic Proof Request")
+            selected_conn = await pick_holder_connection()
+            if not selected_conn:
+                return
+
+            # Get custom schema and attributes
+            schema_name = await prompt("Enter schema name (or press Enter for default): ")
+            if not schema_name:
+                schema_name = DEFAULT_GENERIC_SCHEMA
+
+            attributes_input = await prompt("Enter attributes (comma-separated, or press Enter for default): ")
+            if attributes_input:
+                attributes = _ATTR_SPLIT.split(attributes_input.strip())
+            else:
+                attributes = DEFAULT_GENERIC_ATTRS
+
+            try:
+                proof_request = agent.generate_generic_proof_request(
+                    _aip,
+                    _cred_type,
+                    exchange_tracing,
+                    connection_id=selected_conn,
+                    schema_name=schema_name,
+                    attributes=attributes
                 )
 
-            elif option == "1":
-                log_status("#20 Send University Credential Proof Request")
-                holder_connections = agent.get_holder_connections()
-                
-                if not holder_connections:
-                    log_msg("❌ No holder connections available. Please create invitation first (option 4).")
-                    continue
-                
-                # Show available connections
-                log_msg("Available holder connections:")
-                for i, conn_id in enumerate(holder_connections, 1):
-                    alias = agent.holder_connections[conn_id]["alias"]
-                    log_msg(f"  {i}. {conn_id} ({alias})")
-                
-                if len(holder_connections) == 1:
-                    selected_conn = holder_connections[0]
-                else:
-                    selection = await prompt(f"Select connection (1-{len(holder_connections)}): ")
-                    try:
-                        selected_conn = holder_connections[int(selection) - 1]
-                    except (ValueError, IndexError):
-                        log_msg("Invalid selection")
-                        continue
-                
-                # Generate and send proof request
-                try:
-                    proof_request = agent.generate_university_proof_request(
-                        company_a_agent.aip,
-                        company_a_agent.cred_type,
-                        company_a_agent.revocation,
-                        exchange_tracing,
-                        connection_id=selected_conn
-                    )
-                    
-                    # Update connection stats
-                    agent.holder_connections[selected_conn]["proofs_requested"] += 1
-                    
-                    if company_a_agent.aip == 10:
-                        await agent.admin_POST("/present-proof/send-request", proof_request)
-                    elif company_a_agent.aip == 20:
-                        await agent.admin_POST("/present-proof-2.0/send-request", proof_request)
-                    
-                    log_msg(f"📤 University credential proof request sent to {selected_conn}")
-                    
-                except Exception as e:
-                    log_msg(f"❌ Error sending proof request: {e}")
+                agent.bump_proofs_requested(selected_conn)
 
-            elif option == "2":
-                log_status("#21 Send Generic Proof Request")
-                holder_connections = agent.get_holder_connections()
-                
-                if not holder_connections:
-                    log_msg("❌ No holder connections available.")
-                    continue
-                
-                # Show available connections
-                log_msg("Available holder connections:")
-                for i, conn_id in enumerate(holder_connections, 1):
-                    alias = agent.holder_connections[conn_id]["alias"]
-                    log_msg(f"  {i}. {conn_id} ({alias})")
-                
-                if len(holder_connections) == 1:
-                    selected_conn = holder_connections[0]
+                if _aip == 20:
+                    await agent.admin_POST("/present-proof-2.0/send-request", proof_request)
                 else:
-                    selection = await prompt(f"Select connection (1-{len(holder_connections)}): ")
-                    try:
-                        selected_conn = holder_connections[int(selection) - 1]
-                    except (ValueError, IndexError):
-                        log_msg("Invalid selection")
-                        continue
-                
-                # Get custom schema and attributes
-                schema_name = await prompt("Enter schema name (or press Enter for default): ")
-                if not schema_name:
-                    schema_name = "university registration schema"
-                
-                attributes_input = await prompt("Enter attributes (comma-separated, or press Enter for default): ")
-                if attributes_input:
-                    attributes = [attr.strip() for attr in attributes_input.split(",")]
+                    await agent.admin_POST("/present-proof/send-request", proof_request)
+
+                log_msg(f"📤 Generic proof request sent to {selected_conn}")
+
+            except Exception as e:
+                log_msg(f"❌ Error sending proof request: {e}")
+
+        async def option_connectionless_proof():
+            log_status("#22 Send Connectionless Proof Request")
+
+            try:
+                proof_request = agent.generate_university_proof_request(
+                    _aip,
+                    _cred_type,
+                    _revocation,
+                    exchange_tracing,
+                    connectionless=True
+                )
+
+                if _aip == 10:
+                    proof_req_response = await agent.admin_POST(
+                        "/present-proof/create-request", proof_request
+                    )
+                    pres_req_id = proof_req_response["presentation_exchange_id"]
                 else:
-                    attributes = ["student_name", "university_name", "graduation_year"]
-                
-                try:
-                    proof_request = agent.generate_generic_proof_request(
-                        company_a_agent.aip,
-                        company_a_agent.cred_type,
-                        exchange_tracing,
-                        connection_id=selected_conn,
-                        schema_name=schema_name,
-                        attributes=attributes
+                    proof_req_response = await agent.admin_POST(
+                        "/present-proof-2.0/create-request", proof_request
                     )
-                    
-                    agent.holder_connections[selected_conn]["proofs_requested"] += 1
-                    
-                    if company_a_agent.aip == 20:
-                        await agent.admin_POST("/present-proof-2.0/send-request", proof_request)
-                    else:
-                        await agent.admin_POST("/present-proof/send-request", proof_request)
-                    
-                    log_msg(f"📤 Generic proof request sent to {selected_conn}")
-                    
-                except Exception as e:
-                    log_msg(f"❌ Error sending proof request: {e}")
+                    pres_req_id = proof_req_response["pres_ex_id"]
 
-            elif option == "2a":
-                log_status("#22 Send Connectionless Proof Request")
-                
-                try:
-                    proof_request = agent.generate_university_proof_request(
-                        company_a_agent.aip,
-                        company_a_agent.cred_type,
-                        company_a_agent.revocation,
-                        exchange_tracing,
-                        connectionless=True
-                    )
-                    
-                    if company_a_agent.aip == 10:
-                        proof_req_response = await agent.admin_POST(
-                            "/present-proof/create-request", proof_request
-                        )
-                        pres_req_id = proof_req_response["presentation_exchange_id"]
-                    else:
-                        proof_req_response = await agent.admin_POST(
-                            "/present-proof-2.0/create-request", proof_request
+                url = (
+                    os.getenv("WEBHOOK_TARGET")
+                    or (
+                        "http://"
+                        + os.getenv("DOCKERHOST", "localhost").replace(
+                            "{PORT}", str(agent.admin_port + 1)
                         )
-                        pres_req_id = proof_req_response["pres_ex_id"]
-                    
-                    url = (
-                        os.getenv("WEBHOOK_TARGET")
-                        or (
-                            "http://"
-                            + os.getenv("DOCKERHOST", "localhost").replace(
-                                "{PORT}", str(agent.admin_port + 1)
-                            )
-                            + "/webhooks"
-                        )
-                    ) + f"/pres_req/{pres_req_id}/"
-                    
-                    log_msg(f"Connectionless proof request URL: {url}")
-                    qr = QRCode(border=1)
-                    qr.add_data(url)
-                    log_msg("Scan the following QR code to respond to the proof request:")
-                    qr.print_ascii(invert=True)
-                    
-                except Exception as e:
-                    log_msg(f"❌ Error creating connectionless proof request: {e}")
-
-            elif option == "3":
-                log_status("#23 Send Message to Holder")
-                holder_connections = agent.get_holder_connections()
-                
-                if not holder_connections:
-                    log_msg("❌ No holder connections available.")
-                    continue
-                
-                log_msg("Available holder connections:")
-                for i, conn_id in enumerate(holder_connections, 1):
-                    alias = agent.holder_connections[conn_id]["alias"]
-                    log_msg(f"  {i}. {conn_id} ({alias})")
-                
-                if len(holder_connections) == 1:
-                    selected_conn = holder_connections[0]
-                else:
-                    selection = await prompt(f"Select connection (1-{len(holder_connections)}): ")
-                    try:
-                        selected_conn = holder_connections[int(selection) - 1]
-                    except (ValueError, IndexError):
-                        log_msg("Invalid selection")
-                        continue
-                
-                msg = await prompt("Enter message: ")
-                try:
-                    await agent.admin_POST(
-                        f"/connections/{selected_conn}/send-message",
-                        {"content": msg},
+                        + "/webhooks"
                     )
-                    log_msg(f"📤 Message sent to {selected_conn}")
-                except Exception as e:
-                    log_msg(f"❌ Error sending message: {e}")
+                ) + f"/pres_req/{pres_req_id}/"
+
+                log_msg(f"Connectionless proof request URL: {url}")
+                # QR generation is CPU-bound; render it in the default
+                # executor so the event loop keeps servicing webhooks
+                qr_ascii = await asyncio.get_event_loop().run_in_executor(
+                    None, _render_qr_ascii, url
+                )
+                log_msg(
+                    "Scan the following QR code to respond to the proof request:\n"
+                    + qr_ascii
+                )
 
-            elif option == "4":
-                log_msg("🏢 Creating new invitation for holders to connect to Company A")
-                await company_a_agent.generate_invitation(
+            except Exception as e:
+                log_msg(f"❌ Error creating connectionless proof request: {e}")
+
+        async def option_send_message():
+            log_status("#23 Send Message to Holder")
+            selected_conn = await pick_holder_connection()
+            if not selected_conn:
+                return
+
+            msg = await prompt("Enter message: ")
+            try:
+                await agent.admin_POST(
+                    f"/connections/{selected_conn}/send-message",
+                    {"content": msg},
+                )
+                log_msg(f"📤 Message sent to {selected_conn}")
+            except Exception as e:
+                log_msg(f"❌ Error sending message: {e}")
+
+        async def option_new_invitation():
+            log_msg("🏢 Creating new invitation for holders to connect to Company A")
+            # Invitation creation needs no result here, so run it in the
+            # background and return to the prompt immediately
+            spawn_background(
+                company_a_agent.generate_invitation(
                     display_qr=True,
-                    reuse_connections=company_a_agent.reuse_connections,
-                    multi_use_invitations=company_a_agent.multi_use_invitations,
-                    public_did_connections=company_a_agent.public_did_connections,
+                    reuse_connections=_reuse,
+                    multi_use_invitations=_multi_use,
+                    public_did_connections=_public_did,
                     wait=False,  # Fixed: was wait=True
                 )
-                log_msg("📱 QR code generated! Scan with mobile agent to connect.")
-                log_msg("🔄 Connection will be tracked automatically when established.")
+            )
+            log_msg(
+                "📱 QR code generated! Scan with mobile agent to connect.\n"
+                "🔄 Connection will be tracked automatically when established."
+            )
 
-            elif option == "5":
-                log_status("#24 List Connected Holders")
-                if not agent.holder_connections:
-                    log_msg("❌ No holder connections.")
-                else:
-                    log_msg("🏢 Company A - Connected Holders:")
-                    for conn_id, info in agent.holder_connections.items():
-                        connected_time = datetime.datetime.fromtimestamp(info["connected_at"])
-                        log_msg(f"  • {conn_id} ({info['alias']})")
-                        log_msg(f"    Connected: {connected_time}")
-                        log_msg(f"    Proofs Requested: {info['proofs_requested']}")
-                        log_msg(f"    Proofs Verified: {info['proofs_verified']}")
-
-            elif option == "6":
-                log_status("#25 List Verified Proofs")
-                if not agent.verified_proofs:
-                    log_msg("❌ No verified proofs.")
-                else:
-                    log_msg("🏢 Company A - Verified Proofs:")
-                    for proof_id, info in agent.verified_proofs.items():
-                        verified_time = datetime.datetime.fromtimestamp(info["verified_at"])
-                        log_msg(f"  • Proof ID: {proof_id}")
-                        log_msg(f"    Connection: {info['connection_id']}")
-                        log_msg(f"    Verified: {verified_time}")
-                        
-                        # Show credential data if available
-                        presentation = info.get("presentation", {})
-                        if "requested_proof" in presentation:
-                            revealed_attrs = presentation["requested_proof"].get("revealed_attrs", {})
-                            if revealed_attrs:
-                                log_msg("    Credential Data:")
-                                for attr_name, attr_data in revealed_attrs.items():
-                                    log_msg(f"      {attr_name}: {attr_data.get('raw', 'N/A')}")
-
-            elif option == "7":
-                log_status("#26 View Connection Statistics")
-                if not agent.holder_connections:
-                    log_msg("❌ No connections to show statistics for.")
-                else:
-                    total_connections = len(agent.holder_connections)
-                    total_proofs_requested = sum(info["proofs_requested"] for info in agent.holder_connections.values())
-                    total_proofs_verified = sum(info["proofs_verified"] for info in agent.holder_connections.values())
-                    
-                    log_msg("🏢 Company A - Statistics:")
-                    log_msg(f"  Total Holder Connections: {total_connections}")
-                    log_msg(f"  Total Proof Requests Sent: {total_proofs_requested}")
-                    log_msg(f"  Total Proofs Verified: {total_proofs_verified}")
-                    log_msg(f"  Verification Success Rate: {(total_proofs_verified/total_proofs_requested*100 if total_proofs_requested > 0 else 0):.1f}%")
+        async def option_list_holders():
+            log_status("#24 List Connected Holders")
+            if not agent.holder_count():
+                log_msg("❌ No holder connections.")
+            else:
+                log_lines(
+                    ["🏢 Company A - Connected Holders:"]
+                    + [_HOLDER_ROW_TPL(*row) for row in agent.iter_holder_stats()]
+                )
+
+        async def option_list_proofs():
+            log_status("#25 List Verified Proofs")
+            if not agent.verified_proofs:
+                log_msg("❌ No verified proofs.")
+            else:
+                lines = ["🏢 Company A - Verified Proofs:"]
+                for proof_id, info in agent.verified_proofs.items():
+                    lines.append(f"  • Proof ID: {proof_id}")
+                    lines.append(f"    Connection: {info['connection_id']}")
+                    lines.append(f"    Verified: {info['verified_at_str']}")
+
+                    # Show credential data if available
+                    if info["revealed_lines"]:
+                        lines.append("    Credential Data:")
+                        lines.extend(info["revealed_lines"])
+                log_lines(lines)
+
+        async def option_statistics():
+            log_status("#26 View Connection Statistics")
+            if not agent.holder_count():
+                log_msg("❌ No connections to show statistics for.")
+            else:
+                total_connections = agent.holder_count()
+                total_proofs_requested, total_proofs_verified = agent.proof_totals()
+
+                log_lines([
+                    "🏢 Company A - Statistics:",
+                    f"  Total Holder Connections: {total_connections}",
+                    f"  Total Proof Requests Sent: {total_proofs_requested}",
+                    f"  Total Proofs Verified: {total_proofs_verified}",
+                    f"  Verification Success Rate: {(total_proofs_verified/total_proofs_requested*100 if total_proofs_requested > 0 else 0):.1f}%",
+                ])
+
+        # Built once: each keypress is a single dict lookup instead of
+        # walking the option comparisons in order
+        handlers = {
+            "1": option_univ_proof,
+            "2": option_generic_proof,
+            "2a": option_connectionless_proof,
+            "3": option_send_message,
+            "4": option_new_invitation,
+            "5": option_list_holders,
+            "6": option_list_proofs,
+            "7": option_statistics,
+            "t": option_toggle_tracing,
+            "T": option_toggle_tracing,
+        }
+        if company_a_agent.multitenant:
+            handlers["w"] = handlers["W"] = option_create_wallet
+
+        async for option in prompt_loop(options):
+            if option is not None:
+                option = option.strip()
+
+            if option is None or option in "xX":
+                break
+
+            handler = handlers.get(option)
+            if handler:
+                await handler()
 
         if company_a_agent.show_timing:
             timing = await agent.fetch_timing()
             if timing:
-                for line in agent.format_timing(timing):
-                    log_msg(line)
+                log_lines(agent.format_timing(timing))
 
     finally:
+        # Give outstanding background work a bounded window to finish
+        # rather than sleeping an arbitrary interval after termination
+        if background_tasks:
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*background_tasks, return_exceptions=True),
+                    timeout=5.0,
+                )
+            except asyncio.TimeoutError:
+                for task in background_tasks:
+                    task.cancel()
         terminated = await company_a_agent.terminate()
 
-    await asyncio.sleep(0.1)
-
     if not terminated:
         os._exit(1)
 
@@ -807,6 +1108,19 @@ if __name__ == "__main__":
             print("pydevd_pycharm library was not found")
 
     try:
-        asyncio.get_event_loop().run_until_complete(main(args))
+        # uvloop is a drop-in libuv event loop that speeds up the webhook
+        # and admin traffic noticeably; fall back to the stdlib loop when
+        # it is not installed
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
+    try:
+        asyncio.run(main(args))
     except KeyboardInterrupt:
-        os._exit(1)
\ No newline at end of file
+        # sys.exit lets asyncio.run's cleanup and atexit handlers run;
+        # os._exit stays reserved for the failed-termination path above
+        # where the process may be wedged
+        sys.exit(1)
\ No newline at end of file
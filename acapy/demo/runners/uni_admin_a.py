@@ -2,15 +2,22 @@
 
 import asyncio
 import datetime
+import io
 import json
 import logging
 import os
 import sys
 import time
 import uuid
-from aiohttp import ClientError
+from collections import OrderedDict
+from aiohttp import ClientError, ClientSession, TCPConnector
 from qrcode import QRCode
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from runners.agent_container import (  # noqa:E402
@@ -38,6 +45,60 @@ logging.basicConfig(level=logging.WARNING)
 LOGGER = logging.getLogger(__name__)
 
 
+def _format_pending(approval_id, data, verbose=False):
+    """Format one pending approval as a single display block"""
+    student_data = data["student_data"]
+    if verbose:
+        return (
+            f"Approval ID: {approval_id}\n"
+            f"Request Time: {data['request_time_str']}\n"
+            f"Student ID: {student_data.get('student_id', 'N/A')}\n"
+            f"Student Name: {student_data.get('student_name', 'N/A')}\n"
+            f"University: {student_data.get('university_name', 'N/A')}\n"
+            f"Graduation Year: {student_data.get('graduation_year', 'N/A')}\n"
+            f"CGPA: {student_data.get('cgpa', 'N/A')}"
+        )
+    return (
+        f"ID: {approval_id}\n"
+        f"  Student ID: {student_data.get('student_id', 'N/A')}\n"
+        f"  Student: {student_data.get('student_name', 'N/A')}\n"
+        f"  University: {student_data.get('university_name', 'N/A')}\n"
+        f"  Graduation Year: {student_data.get('graduation_year', 'N/A')}"
+    )
+
+
+def _dumps(obj):
+    """Serialize to a compact JSON string, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+# Banner separators built once instead of re-evaluating "="*N per display
+_BAR60 = "=" * 60
+_BAR50 = "=" * 50
+
+# Menu text is constant, so concatenate it once at import
+_PROMPT_OPTIONS = (
+    "    (1) Approve Pending Credential Request\n"
+    "    (2) Reject Pending Credential Request\n"
+    "    (3) List Pending Approval Requests\n"
+    "    (4) Send Message to Registrar\n"
+    "    (5) Create New Invitation\n"
+    "    (X) Exit?\n[1/2/3/4/5/X] "
+)
+
+
+def _print_invitation(invitation, header, bar=_BAR60):
+    """Display a copyable single-line invitation framed by banner bars"""
+    clean_invitation = _dumps(invitation["invitation"])
+    log_msg(
+        f"\n{bar}\n{header}\n{bar}\n"
+        f"{clean_invitation}\n"
+        f"{bar}\nEND OF INVITATION TO COPY\n{bar}\n"
+    )
+
+
 class UniAdminAgent(AriesAgent):
     def __init__(
         self,
@@ -67,10 +128,33 @@ class UniAdminAgent(AriesAgent):
             log_level=log_level,
             **kwargs,
         )
+        # The base class already shares one ClientSession across all
+        # admin_GET/admin_POST calls; swap it for one whose connector keeps
+        # idle admin-API sockets warm so approvals reuse connections
+        old_session = self.client_session
+        self.client_session = ClientSession(
+            connector=TCPConnector(limit=100, limit_per_host=50, keepalive_timeout=60)
+        )
+        asyncio.get_event_loop().create_task(old_session.close())
+
         self.connection_id = None
         self._connection_ready = None
         self.registrar_connection_id = None
-        self.pending_approvals = {}  # Store pending credential approvals
+        # Pending approvals in insertion (= age) order so expiry can pop
+        # from the front; entries older than the TTL are swept lazily
+        self.pending_approvals = OrderedDict()
+        self._approval_ttl = 3600  # seconds
+        # Per-connection events set by the connections webhook when a
+        # connection reaches "active"; waiters block on these instead of
+        # polling the admin API
+        self._conn_active_events = {}
+        # Last-known connection state per the connections webhook; lets the
+        # send path skip re-fetching state the agent already reported
+        self._conn_states = {}
+        # Rendered QR ASCII keyed by invitation URL: re-displaying or
+        # regenerating an unchanged invitation skips the Reed-Solomon and
+        # matrix rendering work
+        self._qr_cache = {}
         
     async def detect_connection(self):
         await self._connection_ready
@@ -100,27 +184,45 @@ class UniAdminAgent(AriesAgent):
         """
         log_msg(f"Message handler registered for {message_type if message_type else 'all messages'}")
 
+    def render_qr(self, url):
+        """Render the ASCII QR code for an invitation URL, cached by URL"""
+        cached = self._qr_cache.get(url)
+        if cached is None:
+            qr = QRCode(border=1)
+            qr.add_data(url)
+            out = io.StringIO()
+            qr.print_ascii(out=out, invert=True)
+            cached = self._qr_cache[url] = out.getvalue()
+        return cached
+
+    # Constant part of every approval response; per-call fields are merged
+    # over a shallow copy in generate_approval_response
+    _RESPONSE_TEMPLATE = {
+        "type": "credential_approval_response",
+        "admin_id": "ADMIN001",
+    }
+
     def generate_approval_response(self, approval_id, approved, comments=""):
         """Generate approval response message to send back to registrar"""
         # Keep it simple with just the essential data
         # The send_approval_response method will use this directly
-        response = {
-            "type": "credential_approval_response",
+        return {
+            **self._RESPONSE_TEMPLATE,
             "approval_id": approval_id,
             "approved": approved,
             "comments": comments,
             "timestamp": str(int(time.time())),
-            "admin_id": "ADMIN001"
         }
-        return response
 
     async def handle_webhook(self, topic, payload, headers=None):
         """
         Process incoming webhook notifications from ACA-Py
         """
-        log_msg(f"Received webhook: {topic}")
-        log_msg(f"Payload: {json.dumps(payload, indent=2)}")
-        
+        # Deferred %s formatting: the payload is only stringified when a
+        # handler at DEBUG level is actually attached
+        LOGGER.debug("Received webhook: %s", topic)
+        LOGGER.debug("Payload: %s", payload)
+
         if topic == "basicmessages":
             await self.handle_basicmessage(payload)
         elif topic == "connections":
@@ -132,21 +234,53 @@ class UniAdminAgent(AriesAgent):
         content = payload.get("content", "")
         connection_id = payload.get("connection_id", "")
         
-        # Try to parse content as JSON
-        if content:
-            try:
-                content_json = json.loads(content)
-                if isinstance(content_json, dict) and content_json.get("type") == "credential_approval_request":
-                    log_msg("Received credential approval request via webhook")
-                    await self.handle_approval_request(payload)
-            except json.JSONDecodeError:
-                log_msg("Basic message content is not JSON")
+        if not content:
+            return
+
+        # Cheap prefix check: plain-text chat messages cannot be approval
+        # requests, so skip the exception-driven parse probe for them
+        stripped = content.lstrip()
+        if not stripped or stripped[0] not in "{[":
+            LOGGER.debug("Basic message content is not JSON")
+            return
+
+        try:
+            content_json = (
+                orjson.loads(stripped) if orjson is not None else json.loads(stripped)
+            )
+        except ValueError:
+            LOGGER.debug("Basic message content is not valid JSON")
+            return
+
+        if isinstance(content_json, dict) and content_json.get("type") == "credential_approval_request":
+            LOGGER.debug("Received credential approval request via webhook")
+            await self.handle_approval_request(payload)
     
+    def expire_approvals(self):
+        """Drop pending approvals older than the TTL, oldest first"""
+        cutoff = time.time() - self._approval_ttl
+        while self.pending_approvals:
+            oldest = next(iter(self.pending_approvals.values()))
+            if oldest["request_time"] > cutoff:
+                break
+            approval_id, _ = self.pending_approvals.popitem(last=False)
+            log_msg(f"Expired pending approval request: {approval_id}")
+
+    def _conn_active_event(self, conn_id):
+        """Get (or create) the active-state event for a connection"""
+        event = self._conn_active_events.get(conn_id)
+        if event is None:
+            event = self._conn_active_events[conn_id] = asyncio.Event()
+        return event
+
     async def handle_connections(self, payload):
         """Handle connection state changes"""
         conn_id = payload.get("connection_id")
+        if conn_id:
+            self._conn_states[conn_id] = payload.get("state")
         if payload.get("state") == "active" and conn_id:
-            log_msg(f"Connection {conn_id} is now active")
+            LOGGER.debug("Connection %s is now active", conn_id)
+            self._conn_active_event(conn_id).set()
             # If this is from the registrar, store it
             if not self.registrar_connection_id:
                 self.registrar_connection_id = conn_id
@@ -155,103 +289,90 @@ class UniAdminAgent(AriesAgent):
     async def handle_approval_request(self, message_data):
         """Handle incoming credential approval requests from registrar"""
         try:
-            log_msg(f"Received message: {json.dumps(message_data, indent=2)}")
-            
-            # Extract content - handle various message formats
-            content = None
-            
-            # Check for different possible content locations
-            if "content" in message_data:
-                content = message_data["content"]
-                
+            LOGGER.debug("Received message: %s", message_data)
+
+            # Single-pass normalization: parse the content once, then one
+            # dict check decides whether this is an approval request
+            content = message_data.get("content")
             if not content:
-                log_msg("No content found in message")
+                LOGGER.debug("No content found in message")
                 return
-                
-            # Parse the content if it's a string
+
             if isinstance(content, str):
                 try:
                     content = json.loads(content)
                 except json.JSONDecodeError:
-                    log_msg(f"Could not parse message content as JSON: {content}")
-                    # It might be a simple text message, not JSON
-                    content = {"text": content}
-            
-            # Look for approval request data
-            request_data = None
-            
-            # Check various paths where the request data might be found
-            if isinstance(content, dict):
-                if "type" in content and content.get("type") == "credential_approval_request":
-                    request_data = content
-                elif "student_data" in content:
-                    request_data = content
-            
-            if not request_data:
-                log_msg("No credential request data found in message")
+                    LOGGER.debug(
+                        "Could not parse message content as JSON: %s", content
+                    )
+                    return
+
+            if not isinstance(content, dict) or (
+                content.get("type") != "credential_approval_request"
+                and "student_data" not in content
+            ):
+                LOGGER.debug("Message is not a credential approval request")
                 return
-                
-            # Determine if this is an approval request
-            is_approval_request = False
-            if "type" in request_data and request_data["type"] == "credential_approval_request":
-                is_approval_request = True
-            elif "student_data" in request_data:
-                is_approval_request = True
-                
-            if is_approval_request:
-                # Extract the approval ID
-                approval_id = request_data.get("approval_id")
-                if not approval_id and "@id" in message_data:
-                    approval_id = message_data["@id"]
-                elif not approval_id:
-                    approval_id = str(uuid.uuid4())  # Generate one if missing
-                
-                # Extract student data
-                student_data = request_data.get("student_data", {})
-                
-                # Determine connection ID
-                connection_id = None
-                if "connection_id" in message_data:
-                    connection_id = message_data["connection_id"]
-                elif hasattr(self, "registrar_connection_id") and self.registrar_connection_id:
-                    connection_id = self.registrar_connection_id
-                elif "connection_id" in request_data:
-                    connection_id = request_data["connection_id"]
-                    
-                if not connection_id and self.connection_id:
-                    connection_id = self.connection_id
-                
-                # Store the pending approval
-                self.pending_approvals[approval_id] = {
-                    "student_data": student_data,
-                    "request_time": time.time(),
-                    "registrar_connection_id": connection_id
-                }
-                
-                log_msg(f"\n=== CREDENTIAL APPROVAL REQUEST RECEIVED ===")
-                log_msg(f"Approval ID: {approval_id}")
-                log_msg(f"From connection: {connection_id}")
-                log_msg(f"Student ID: {student_data.get('student_id', 'N/A')}")
-                log_msg(f"Student Name: {student_data.get('student_name', 'N/A')}")
-                log_msg(f"University: {student_data.get('university_name', 'N/A')}")
-                log_msg(f"Graduation Year: {student_data.get('graduation_year', 'N/A')}")
-                log_msg(f"CGPA: {student_data.get('cgpa', 'N/A')}")
-                log_msg("=== Use option '1' to approve or '2' to reject ===\n")
-            else:
-                log_msg(f"Message is not a credential approval request")
-                
-        except Exception as e:
-            log_msg(f"Error handling approval request: {e}")
-            import traceback
-            traceback.print_exc()
+
+            request_data = content
+
+            # Extract the approval ID; fall back to the message id, then a
+            # generated one
+            approval_id = (
+                request_data.get("approval_id")
+                or message_data.get("@id")
+                or str(uuid.uuid4())
+            )
+
+            # Extract student data
+            student_data = request_data.get("student_data", {})
+
+            # Determine connection ID; all four sources are plain attributes
+            # or .get() calls, so a short-circuiting or-chain replaces the
+            # hasattr ladder (registrar_connection_id is always defined)
+            connection_id = (
+                message_data.get("connection_id")
+                or self.registrar_connection_id
+                or request_data.get("connection_id")
+                or self.connection_id
+            )
+
+            # Sweep aged-out entries, then store the pending approval; the
+            # display timestamp is formatted once here rather than on every
+            # listing render
+            self.expire_approvals()
+            now = time.time()
+            self.pending_approvals[approval_id] = {
+                "student_data": student_data,
+                "request_time": now,
+                "request_time_str": datetime.datetime.fromtimestamp(
+                    now
+                ).isoformat(sep=" ", timespec="seconds"),
+                "registrar_connection_id": connection_id
+            }
+
+            log_msg(f"\n=== CREDENTIAL APPROVAL REQUEST RECEIVED ===")
+            log_msg(f"Approval ID: {approval_id}")
+            log_msg(f"From connection: {connection_id}")
+            log_msg(f"Student ID: {student_data.get('student_id', 'N/A')}")
+            log_msg(f"Student Name: {student_data.get('student_name', 'N/A')}")
+            log_msg(f"University: {student_data.get('university_name', 'N/A')}")
+            log_msg(f"Graduation Year: {student_data.get('graduation_year', 'N/A')}")
+            log_msg(f"CGPA: {student_data.get('cgpa', 'N/A')}")
+            log_msg("=== Use option '1' to approve or '2' to reject ===\n")
+
+        except Exception:
+            # LOGGER.exception captures the traceback from sys.exc_info()
+            # without the inline traceback import or a synchronous stderr
+            # flush on the event loop
+            LOGGER.exception("Error handling approval request")
 
     async def send_approval_response(self, approval_id, approved, comments=""):
         """Send approval response back to registrar"""
-        if approval_id not in self.pending_approvals:
+        approval_data = self.pending_approvals.get(approval_id)
+        if approval_data is None:
             log_msg(f"No pending approval found for ID: {approval_id}")
             return
-            
-        approval_data = self.pending_approvals[approval_id]
         registrar_connection_id = approval_data["registrar_connection_id"]
         
         if not registrar_connection_id:
@@ -262,45 +383,39 @@ class UniAdminAgent(AriesAgent):
             log_msg("No connection ID available to send message. Cannot send approval response.")
             return
             
-        # Check if the connection is active before sending
-        log_msg(f"Checking connection status for {registrar_connection_id}...")
-        try:
-            conn = await self.admin_GET(f"/connections/{registrar_connection_id}")
-            if conn["state"] != "active":
-                log_msg(f"Connection {registrar_connection_id} is not active (state: {conn['state']})")
-                log_msg("Waiting for connection to become active...")
-                
-                # Wait for the connection to become active
-                for _ in range(10):  # Try for up to 10 seconds
-                    await asyncio.sleep(1)
-                    conn = await self.admin_GET(f"/connections/{registrar_connection_id}")
-                    log_msg(f"Connection state: {conn['state']}")
-                    if conn["state"] == "active":
+        # Check if the connection is active before sending; the webhook-fed
+        # state cache covers the normal case without an extra admin GET
+        if self._conn_states.get(registrar_connection_id) != "active":
+            log_msg(f"Checking connection status for {registrar_connection_id}...")
+            try:
+                conn = await self.admin_GET(f"/connections/{registrar_connection_id}")
+                if conn["state"] != "active":
+                    log_msg(f"Connection {registrar_connection_id} is not active (state: {conn['state']})")
+                    log_msg("Waiting for connection to become active...")
+
+                    # The connections webhook sets this event on the "active"
+                    # transition, so wait on it instead of polling the admin API
+                    try:
+                        await asyncio.wait_for(
+                            self._conn_active_event(registrar_connection_id).wait(),
+                            timeout=10,
+                        )
                         log_msg("Connection is now active!")
-                        break
-                else:
-                    log_msg("Connection did not become active. Cannot send message.")
-                    return
-        except Exception as e:
-            log_msg(f"Error checking connection status: {e}")
+                    except asyncio.TimeoutError:
+                        log_msg("Connection did not become active. Cannot send message.")
+                        return
+            except Exception as e:
+                log_msg(f"Error checking connection status: {e}")
             
-        # Generate the response
+        # Generate the response; serialized once, reused for the log and
+        # the message body (the old "simplified" copy was byte-identical)
         response = self.generate_approval_response(approval_id, approved, comments)
-        log_msg(f"Sending approval response: {json.dumps(response, indent=2)}")
-        
-        # Simplify the message to ensure compatibility
-        simplified_response = {
-            "type": "credential_approval_response",
-            "approval_id": approval_id,
-            "approved": approved,
-            "comments": comments,
-            "timestamp": str(int(time.time())),
-            "admin_id": "ADMIN001"
-        }
-        
+        response_json = _dumps(response)
+        log_msg(f"Sending approval response: {response_json}")
+
         # Use only the standard endpoint that should work in all versions
         endpoint = f"/connections/{registrar_connection_id}/send-message"
-        payload = {"content": json.dumps(simplified_response)}
+        payload = {"content": response_json}
         
         try:
             log_msg(f"Sending response using endpoint: {endpoint}")
@@ -313,7 +428,7 @@ class UniAdminAgent(AriesAgent):
                 
         if success:
             # Remove from pending approvals
-            del self.pending_approvals[approval_id]
+            self.pending_approvals.pop(approval_id, None)
             
             status = "APPROVED" if approved else "REJECTED"
             log_msg(f"Approval response sent - {status} for approval ID: {approval_id}")
@@ -342,13 +457,8 @@ async def main(args):
     endpoint = os.environ.get('ENDPOINT', 'http://172.17.0.1:8070')
     log_msg(f"Using endpoint: {endpoint}")
     
-    if extra_args is None:
-        extra_args = []
-        
     # Add endpoint to extra args
-    extra_args.extend([
-        "--endpoint", endpoint
-    ])
+    extra_args = (extra_args or []) + ["--endpoint", endpoint]
 
     uni_admin_a_agent = await create_agent_with_args(
         args,
@@ -422,24 +532,15 @@ async def main(args):
                 wait=False,
             )
             
-            # Generate clean, single-line JSON without extra whitespace
-            clean_invitation = json.dumps(invitation["invitation"], separators=(',', ':'))
-            
             # Display in a way that's easy to copy
-            log_msg("\n" + "="*60)
-            log_msg("COPY THE FULL LINE BELOW FOR REGISTRAR AGENT:")
-            log_msg("="*60)
-            log_msg(clean_invitation)
-            log_msg("="*60)
-            log_msg("END OF INVITATION TO COPY")
-            log_msg("="*60 + "\n")
-            
+            _print_invitation(
+                invitation, "COPY THE FULL LINE BELOW FOR REGISTRAR AGENT:"
+            )
+
             # Also show the QR code for mobile connections
-            qr = QRCode(border=1)
-            qr.add_data(invitation["invitation_url"])
             log_msg("QR Code for mobile wallets:")
-            qr.print_ascii(invert=True)
-            
+            log_msg(agent.render_qr(invitation["invitation_url"]))
+
             log_msg("Admin agent ready to receive connection from registrar")
                 
         except Exception as e:
@@ -448,16 +549,7 @@ async def main(args):
         # The agent is ready - webhooks will handle incoming messages automatically
         log_msg("Agent ready to process credential approval requests from registrar via webhooks")
 
-        options = (
-            "    (1) Approve Pending Credential Request\n"
-            "    (2) Reject Pending Credential Request\n"
-            "    (3) List Pending Approval Requests\n"
-            "    (4) Send Message to Registrar\n"
-            "    (5) Create New Invitation\n"
-            "    (X) Exit?\n[1/2/3/4/5/X] "
-        )
-
-        async for option in prompt_loop(options):
+        async for option in prompt_loop(_PROMPT_OPTIONS):
             if option is not None:
                 option = option.strip()
 
@@ -466,20 +558,19 @@ async def main(args):
 
             elif option == "1":
                 # Approve credential request
+                agent.expire_approvals()
                 if not agent.pending_approvals:
                     log_msg("No pending approval requests.")
                     continue
                 
-                log_msg("\nPending Approval Requests:")
-                for approval_id, data in agent.pending_approvals.items():
-                    student_data = data["student_data"]
-                    log_msg(f"ID: {approval_id}")
-                    log_msg(f"  Student ID: {student_data.get('student_id', 'N/A')}")
-                    log_msg(f"  Student: {student_data.get('student_name', 'N/A')}")
-                    log_msg(f"  University: {student_data.get('university_name', 'N/A')}")
-                    log_msg(f"  Graduation Year: {student_data.get('graduation_year', 'N/A')}")
-                    log_msg("")
-                
+                log_msg(
+                    "\nPending Approval Requests:\n"
+                    + "\n\n".join(
+                        _format_pending(approval_id, data)
+                        for approval_id, data in agent.pending_approvals.items()
+                    )
+                )
+
                 approval_id = await prompt("Enter approval ID to approve: ")
                 comments = await prompt("Enter approval comments (optional): ")
                 
@@ -487,20 +578,19 @@ async def main(args):
 
             elif option == "2":
                 # Reject credential request
+                agent.expire_approvals()
                 if not agent.pending_approvals:
                     log_msg("No pending approval requests.")
                     continue
                 
-                log_msg("\nPending Approval Requests:")
-                for approval_id, data in agent.pending_approvals.items():
-                    student_data = data["student_data"]
-                    log_msg(f"ID: {approval_id}")
-                    log_msg(f"  Student ID: {student_data.get('student_id', 'N/A')}")
-                    log_msg(f"  Student: {student_data.get('student_name', 'N/A')}")
-                    log_msg(f"  University: {student_data.get('university_name', 'N/A')}")
-                    log_msg(f"  Graduation Year: {student_data.get('graduation_year', 'N/A')}")
-                    log_msg("")
-                
+                log_msg(
+                    "\nPending Approval Requests:\n"
+                    + "\n\n".join(
+                        _format_pending(approval_id, data)
+                        for approval_id, data in agent.pending_approvals.items()
+                    )
+                )
+
                 approval_id = await prompt("Enter approval ID to reject: ")
                 comments = await prompt("Enter rejection reason: ")
                 
@@ -508,20 +598,17 @@ async def main(args):
 
             elif option == "3":
                 # List pending requests
+                agent.expire_approvals()
                 if not agent.pending_approvals:
                     log_msg("No pending approval requests.")
                 else:
-                    log_msg("\n=== PENDING APPROVAL REQUESTS ===")
-                    for approval_id, data in agent.pending_approvals.items():
-                        student_data = data["student_data"]
-                        request_time = datetime.datetime.fromtimestamp(data["request_time"])
-                        log_msg(f"\nApproval ID: {approval_id}")
-                        log_msg(f"Request Time: {request_time}")
-                        log_msg(f"Student ID: {student_data.get('student_id', 'N/A')}")
-                        log_msg(f"Student Name: {student_data.get('student_name', 'N/A')}")
-                        log_msg(f"University: {student_data.get('university_name', 'N/A')}")
-                        log_msg(f"Graduation Year: {student_data.get('graduation_year', 'N/A')}")
-                        log_msg(f"CGPA: {student_data.get('cgpa', 'N/A')}")
+                    log_msg(
+                        "\n=== PENDING APPROVAL REQUESTS ===\n\n"
+                        + "\n\n".join(
+                            _format_pending(approval_id, data, verbose=True)
+                            for approval_id, data in agent.pending_approvals.items()
+                        )
+                    )
 
             elif option == "4":
                 # Send message to registrar
@@ -552,23 +639,14 @@ async def main(args):
                     wait=False,
                 )
                 
-                # Generate clean, single-line JSON without extra whitespace
-                clean_invitation = json.dumps(invitation["invitation"], separators=(',', ':'))
-                
                 # Display in a way that's easy to copy
-                log_msg("\n" + "="*50)
-                log_msg("COPY THE FULL LINE BELOW FOR REGISTRAR:")
-                log_msg("="*50)
-                log_msg(clean_invitation)
-                log_msg("="*50)
-                log_msg("END OF INVITATION TO COPY")
-                log_msg("="*50 + "\n")
-                
+                _print_invitation(
+                    invitation, "COPY THE FULL LINE BELOW FOR REGISTRAR:", bar=_BAR50
+                )
+
                 # Also show the QR code for mobile connections
-                qr = QRCode(border=1)
-                qr.add_data(invitation["invitation_url"])
                 log_msg("QR Code for mobile wallets:")
-                qr.print_ascii(invert=True)
+                log_msg(agent.render_qr(invitation["invitation_url"]))
 
         if uni_admin_a_agent.show_timing:
             timing = await uni_admin_a_agent.agent.fetch_timing()
@@ -617,6 +695,15 @@ if __name__ == "__main__":
             print("pydevd_pycharm library was not found")
 
     try:
-        asyncio.get_event_loop().run_until_complete(main(args))
+        # The agent is almost entirely I/O-bound; uvloop speeds up selector
+        # wakeups and socket reads when installed, with no other changes
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
+    try:
+        asyncio.run(main(args))
     except KeyboardInterrupt:
         os._exit(1)
\ No newline at end of file
@@ -1,15 +1,22 @@
 #!/usr/bin/env python3
 import asyncio
 import datetime
+import io
 import json
 import logging
 import os
 import sys
 import time
 import uuid
-from aiohttp import ClientError
+from collections import OrderedDict
+from aiohttp import ClientSession, TCPConnector
 from qrcode import QRCode
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from runners.agent_container import (  # noqa:E402
@@ -20,65 +27,206 @@ from runners.agent_container import (  # noqa:E402
 from runners.support.agent import (  # noqa:E402
     CRED_FORMAT_INDY,
     CRED_FORMAT_JSON_LD,
-    SIG_TYPE_BLS,
 )
 from runners.support.utils import (  # noqa:E402
     log_msg,
     log_status,
     prompt,
-    prompt_loop,
 )
 
 CRED_PREVIEW_TYPE = "https://didcomm.org/issue-credential/2.0/credential-preview"
 SELF_ATTESTED = os.getenv("SELF_ATTESTED")
-DEMO_EXTRA_AGENT_ARGS = os.getenv("DEMO_EXTRA_AGENT_ARGS")
+# Parsed once at import; a malformed value fails here rather than at run
+_EXTRA_AGENT_ARGS = (
+    json.loads(os.environ["DEMO_EXTRA_AGENT_ARGS"])
+    if "DEMO_EXTRA_AGENT_ARGS" in os.environ
+    else None
+)
 
 logging.basicConfig(level=logging.WARNING)
 LOGGER = logging.getLogger(__name__)
 
 
+# Banner separators built once instead of re-evaluating "="*N per display
+_BAR60 = "=" * 60
+_BAR50 = "=" * 50
+
+
+def _print_invitation(invitation, header, bar=_BAR60):
+    """Display a copyable single-line invitation framed by banner bars"""
+    clean_invitation = _dumps(invitation["invitation"])
+    log_msg(
+        f"\n{bar}\n{header}\n{bar}\n"
+        f"{clean_invitation}\n"
+        f"{bar}\nEND OF INVITATION TO COPY\n{bar}\n"
+    )
+
+
+def _render_qr_ascii(url):
+    """Render a QR code for url to an ASCII string (CPU-bound, run off-loop)"""
+    qr = QRCode(border=1)
+    qr.add_data(url)
+    out = io.StringIO()
+    qr.print_ascii(out=out, invert=True)
+    return out.getvalue()
+
+
+def _format_pending(approval_id, data, verbose=False):
+    """Format one pending approval as a single display block"""
+    student_data = data["student_data"]
+    if verbose:
+        request_time = datetime.datetime.fromtimestamp(data["request_time"])
+        return (
+            f"Approval ID: {approval_id}\n"
+            f"Request Time: {request_time}\n"
+            f"Student ID: {student_data.get('student_id', 'N/A')}\n"
+            f"Student Name: {student_data.get('student_name', 'N/A')}\n"
+            f"University: {student_data.get('university_name', 'N/A')}\n"
+            f"Graduation Year: {student_data.get('graduation_year', 'N/A')}\n"
+            f"CGPA: {student_data.get('cgpa', 'N/A')}"
+        )
+    return (
+        f"ID: {approval_id}\n"
+        f"  Student ID: {student_data.get('student_id', 'N/A')}\n"
+        f"  Student: {student_data.get('student_name', 'N/A')}\n"
+        f"  University: {student_data.get('university_name', 'N/A')}\n"
+        f"  Graduation Year: {student_data.get('graduation_year', 'N/A')}"
+    )
+
+
+def _loads(s):
+    """Parse a JSON string, using orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
+
+
+def _dumps(obj):
+    """Serialize to a compact JSON string, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
 class UniAdminBAgent(AriesAgent):
-    def __init__(
-        self,
-        ident: str,
-        http_port: int,
-        admin_port: int,
-        no_auto: bool = False,
-        endorser_role: str = None,
-        revocation: bool = False,
-        anoncreds_legacy_revocation: str = None,
-        log_file: str = None,
-        log_config: str = None,
-        log_level: str = None,
-        **kwargs,
-    ):
-        super().__init__(
-            ident,
-            http_port,
-            admin_port,
-            prefix="UniAdminB",
-            no_auto=no_auto,
-            endorser_role=endorser_role,
-            revocation=revocation,
-            anoncreds_legacy_revocation=anoncreds_legacy_revocation,
-            log_file=log_file,
-            log_config=log_config,
-            log_level=log_level,
-            **kwargs,
+    # Cap on pending approvals kept in memory; oldest entries are evicted
+    # first so a long-running admin process cannot grow without bound
+    MAX_PENDING_APPROVALS = 10_000
+
+    def __init__(self, *args, **kwargs):
+        # Every keyword is forwarded untouched, so skip re-declaring the
+        # base signature and only pin the prefix this agent owns
+        kwargs.setdefault("prefix", "UniAdminB")
+        super().__init__(*args, **kwargs)
+        # The base class already shares one ClientSession across all admin
+        # calls; swap it for one with connection pooling tuned for the
+        # steady trickle of admin API traffic this agent generates
+        old_session = self.client_session
+        self.client_session = ClientSession(
+            connector=TCPConnector(limit=32, keepalive_timeout=75)
         )
+        asyncio.get_event_loop().create_task(old_session.close())
+
         self.connection_id = None
         self._connection_ready = None
         self.registrar_connection_id = None
-        self.pending_approvals = {}  # Store pending credential approvals
-        
+        # Pending credential approvals, oldest first for bounded eviction
+        self.pending_approvals = OrderedDict()
+        # Rendered pending-approval listings, rebuilt only when the queue
+        # changes rather than on every menu keystroke
+        self._listing_cache = {}
+        # Webhook topic dispatch table, one dict lookup per event instead
+        # of an if/elif chain
+        self._topic_handlers = {
+            "basicmessages": self.handle_basicmessage,
+            "connections": self.handle_connections,
+        }
+        # Approval responses are drained by a background worker so the
+        # menu prompt is not blocked on each admin API round-trip
+        self._send_q = asyncio.Queue()
+        self._sender_task = None
+
+    async def admin_request(
+        self, method, path, data=None, text=False, params=None, headers=None
+    ):
+        if orjson is None:
+            return await super().admin_request(
+                method, path, data=data, text=text, params=params, headers=headers
+            )
+        # Serialize outbound bodies with orjson and parse response bytes
+        # directly, bypassing stdlib json in both directions
+        params = {k: v for (k, v) in (params or {}).items() if v is not None}
+        headers = dict(headers) if headers else {}
+        if data is not None:
+            headers["Content-Type"] = "application/json"
+        async with self.client_session.request(
+            method,
+            self.admin_url + path,
+            data=orjson.dumps(data) if data is not None else None,
+            params=params,
+            headers=headers,
+        ) as resp:
+            resp_body = await resp.read()
+            try:
+                resp.raise_for_status()
+            except Exception as e:
+                # try to retrieve and print text on error
+                raise Exception(f"Error: {resp_body.decode(errors='replace')}") from e
+            if not resp_body and not text:
+                return None
+            if not text:
+                try:
+                    return orjson.loads(resp_body)
+                except orjson.JSONDecodeError as e:
+                    raise Exception(f"Error decoding JSON: {resp_body}") from e
+            return resp_body.decode()
+
+    def queue_approval_response(self, approval_id, approved, comments=""):
+        """Queue an approval response for the background sender"""
+        if self._sender_task is None:
+            self._sender_task = asyncio.get_event_loop().create_task(
+                self._approval_sender()
+            )
+        self._send_q.put_nowait((approval_id, approved, comments))
+
+    async def _approval_sender(self):
+        """Send queued approval responses one at a time"""
+        while True:
+            approval_id, approved, comments = await self._send_q.get()
+            try:
+                await self.send_approval_response(approval_id, approved, comments)
+            except Exception:
+                LOGGER.exception("Error sending queued approval response")
+            finally:
+                self._send_q.task_done()
+
+    def pending_listing(self, verbose=False):
+        """Return the pending approvals rendered as one string, cached"""
+        listing = self._listing_cache.get(verbose)
+        if listing is None:
+            listing = "\n\n".join(
+                _format_pending(approval_id, data, verbose=verbose)
+                for approval_id, data in self.pending_approvals.items()
+            )
+            self._listing_cache[verbose] = listing
+        return listing
+
     async def detect_connection(self):
         await self._connection_ready
         self._connection_ready = None
 
     @property
     def connection_ready(self):
-        return self._connection_ready.done() and self._connection_ready.result()
-        
+        # _connection_ready stays a Future because agent_container creates
+        # and resolves it (generate_invitation / input_invitation assign a
+        # fresh Future, handle_connections calls set_result); guard against
+        # None so polling before an invitation exists is just "not ready"
+        return (
+            self._connection_ready is not None
+            and self._connection_ready.done()
+            and self._connection_ready.result()
+        )
+
     def register_webhook_handler(self, handler):
         """
         Register a webhook handler function to process incoming webhooks.
@@ -99,47 +247,58 @@ class UniAdminBAgent(AriesAgent):
         """
         log_msg(f"Message handler registered for {message_type if message_type else 'all messages'}")
 
+    # Static fields of the approval response, merged with the per-call
+    # fields instead of rebuilding the whole dict on every reply
+    _RESPONSE_TEMPLATE = {
+        "type": "credential_approval_response",
+        "admin_id": "ADMIN002",  # UniAdminB identifier
+    }
+
     def generate_approval_response(self, approval_id, approved, comments=""):
         """Generate approval response message to send back to registrar"""
         # Keep it simple with just the essential data
         # The send_approval_response method will use this directly
-        response = {
-            "type": "credential_approval_response",
+        return {
+            **self._RESPONSE_TEMPLATE,
             "approval_id": approval_id,
             "approved": approved,
             "comments": comments,
             "timestamp": str(int(time.time())),
-            "admin_id": "ADMIN002"  # UniAdminB identifier
         }
-        return response
 
     async def handle_webhook(self, topic, payload, headers=None):
         """
         Process incoming webhook notifications from ACA-Py
         """
-        log_msg(f"Received webhook: {topic}")
-        log_msg(f"Payload: {json.dumps(payload, indent=2)}")
+        LOGGER.debug("Received webhook: %s", topic)
+        LOGGER.debug("Payload: %s", payload)
         
-        if topic == "basicmessages":
-            await self.handle_basicmessage(payload)
-        elif topic == "connections":
-            await self.handle_connections(payload)
+        handler = self._topic_handlers.get(topic)
+        if handler:
+            await handler(payload)
     
     async def handle_basicmessage(self, payload):
         """Handle incoming basic message webhook"""
-        message_id = payload.get("message_id", "")
         content = payload.get("content", "")
-        connection_id = payload.get("connection_id", "")
-        
-        # Try to parse content as JSON
-        if content:
-            try:
-                content_json = json.loads(content)
-                if isinstance(content_json, dict) and content_json.get("type") == "credential_approval_request":
-                    log_msg("Received credential approval request via webhook")
-                    await self.handle_approval_request(payload)
-            except json.JSONDecodeError:
-                log_msg("Basic message content is not JSON")
+        if not content:
+            return
+
+        # Plain chat messages are the common case; a first-character check
+        # skips both the JSON parse and the exception it would raise
+        stripped = content.lstrip()
+        if not stripped or stripped[0] not in "{[":
+            LOGGER.debug("Basic message content is not JSON")
+            return
+
+        try:
+            content_json = _loads(stripped)
+        except ValueError:
+            LOGGER.debug("Basic message content is not JSON")
+            return
+
+        if isinstance(content_json, dict) and content_json.get("type") == "credential_approval_request":
+            LOGGER.debug("Received credential approval request via webhook")
+            await self.handle_approval_request(payload)
     
     async def handle_connections(self, payload):
         """Handle connection state changes"""
@@ -154,8 +313,8 @@ class UniAdminBAgent(AriesAgent):
     async def handle_approval_request(self, message_data):
         """Handle incoming credential approval requests from registrar"""
         try:
-            log_msg(f"Received message: {json.dumps(message_data, indent=2)}")
-            
+            LOGGER.debug("Received message: %s", message_data)
+
             # Extract content - handle various message formats
             content = None
             
@@ -164,15 +323,15 @@ class UniAdminBAgent(AriesAgent):
                 content = message_data["content"]
                 
             if not content:
-                log_msg("No content found in message")
+                LOGGER.debug("No content found in message")
                 return
-                
+
             # Parse the content if it's a string
             if isinstance(content, str):
                 try:
-                    content = json.loads(content)
-                except json.JSONDecodeError:
-                    log_msg(f"Could not parse message content as JSON: {content}")
+                    content = _loads(content)
+                except ValueError:
+                    LOGGER.debug("Could not parse message content as JSON: %s", content)
                     # It might be a simple text message, not JSON
                     content = {"text": content}
             
@@ -187,7 +346,7 @@ class UniAdminBAgent(AriesAgent):
                     request_data = content
             
             if not request_data:
-                log_msg("No credential request data found in message")
+                LOGGER.debug("No credential request data found in message")
                 return
                 
             # Determine if this is an approval request
@@ -226,7 +385,11 @@ class UniAdminBAgent(AriesAgent):
                     "request_time": time.time(),
                     "registrar_connection_id": connection_id
                 }
-                
+                while len(self.pending_approvals) > self.MAX_PENDING_APPROVALS:
+                    evicted_id, _ = self.pending_approvals.popitem(last=False)
+                    LOGGER.debug("Evicted oldest pending approval: %s", evicted_id)
+                self._listing_cache.clear()
+
                 log_msg(f"\n=== CREDENTIAL APPROVAL REQUEST RECEIVED ===")
                 log_msg(f"Approval ID: {approval_id}")
                 log_msg(f"From connection: {connection_id}")
@@ -237,12 +400,10 @@ class UniAdminBAgent(AriesAgent):
                 log_msg(f"CGPA: {student_data.get('cgpa', 'N/A')}")
                 log_msg("=== Use option '1' to approve or '2' to reject ===\n")
             else:
-                log_msg(f"Message is not a credential approval request")
-                
-        except Exception as e:
-            log_msg(f"Error handling approval request: {e}")
-            import traceback
-            traceback.print_exc()
+                LOGGER.debug("Message is not a credential approval request")
+
+        except Exception:
+            LOGGER.exception("Error handling approval request")
 
     async def send_approval_response(self, approval_id, approved, comments=""):
         """Send approval response back to registrar"""
@@ -285,21 +446,12 @@ class UniAdminBAgent(AriesAgent):
             
         # Generate the response
         response = self.generate_approval_response(approval_id, approved, comments)
-        log_msg(f"Sending approval response: {json.dumps(response, indent=2)}")
-        
-        # Simplify the message to ensure compatibility
-        simplified_response = {
-            "type": "credential_approval_response",
-            "approval_id": approval_id,
-            "approved": approved,
-            "comments": comments,
-            "timestamp": str(int(time.time())),
-            "admin_id": "ADMIN002"
-        }
-        
+        response_json = _dumps(response)
+        log_msg(f"Sending approval response: {response_json}")
+
         # Use only the standard endpoint that should work in all versions
         endpoint = f"/connections/{registrar_connection_id}/send-message"
-        payload = {"content": json.dumps(simplified_response)}
+        payload = {"content": response_json}
         
         try:
             log_msg(f"Sending response using endpoint: {endpoint}")
@@ -313,7 +465,8 @@ class UniAdminBAgent(AriesAgent):
         if success:
             # Remove from pending approvals
             del self.pending_approvals[approval_id]
-            
+            self._listing_cache.clear()
+
             status = "APPROVED" if approved else "REJECTED"
             log_msg(f"Approval response sent - {status} for approval ID: {approval_id}")
         else:
@@ -321,13 +474,11 @@ class UniAdminBAgent(AriesAgent):
 
 
 async def main(args):
-    extra_args = None
-    if DEMO_EXTRA_AGENT_ARGS:
-        extra_args = json.loads(DEMO_EXTRA_AGENT_ARGS)
+    extra_args = _EXTRA_AGENT_ARGS
+    if extra_args:
         print("Got extra args:", extra_args)
-        
+
     # Fix Docker networking - when running in Docker containers, set correct endpoint
-    import os
     if os.path.exists("/.dockerenv"):  # We're running inside a Docker container
         log_msg("Detected Docker container environment")
         # Set the external host to Docker bridge gateway for proper networking
@@ -341,13 +492,9 @@ async def main(args):
     endpoint = os.environ.get('ENDPOINT', 'http://172.17.0.1:8100')
     log_msg(f"Using endpoint: {endpoint}")
     
-    if extra_args is None:
-        extra_args = []
-        
-    # Add endpoint to extra args
-    extra_args.extend([
-        "--endpoint", endpoint
-    ])
+    # Add endpoint to extra args; copy so the module-level parse is not
+    # mutated across calls
+    extra_args = (extra_args or []) + ["--endpoint", endpoint]
 
     uni_admin_b_agent = await create_agent_with_args(
         args,
@@ -421,24 +568,19 @@ async def main(args):
                 wait=False,
             )
             
-            # Generate clean, single-line JSON without extra whitespace
-            clean_invitation = json.dumps(invitation["invitation"], separators=(',', ':'))
-            
             # Display in a way that's easy to copy
-            log_msg("\n" + "="*60)
-            log_msg("COPY THE FULL LINE BELOW FOR REGISTRAR AGENT:")
-            log_msg("="*60)
-            log_msg(clean_invitation)
-            log_msg("="*60)
-            log_msg("END OF INVITATION TO COPY")
-            log_msg("="*60 + "\n")
-            
-            # Also show the QR code for mobile connections
-            qr = QRCode(border=1)
-            qr.add_data(invitation["invitation_url"])
-            log_msg("QR Code for mobile wallets:")
-            qr.print_ascii(invert=True)
-            
+            _print_invitation(
+                invitation, "COPY THE FULL LINE BELOW FOR REGISTRAR AGENT:"
+            )
+
+            # Also show the QR code for mobile connections; rendering is
+            # CPU-bound, so run it in the default executor to keep the
+            # event loop servicing webhooks
+            qr_ascii = await asyncio.get_event_loop().run_in_executor(
+                None, _render_qr_ascii, invitation["invitation_url"]
+            )
+            log_msg("QR Code for mobile wallets:\n" + qr_ascii)
+
             log_msg("Admin agent ready to receive connection from registrar")
                 
         except Exception as e:
@@ -456,7 +598,8 @@ async def main(args):
             "    (X) Exit?\n[1/2/3/4/5/X] "
         )
 
-        async for option in prompt_loop(options):
+        while True:
+            option = await prompt(options)
             if option is not None:
                 option = option.strip()
             if option is None or option in "xX":
@@ -468,20 +611,12 @@ async def main(args):
                     log_msg("No pending approval requests.")
                     continue
                 
-                log_msg("\nPending Approval Requests:")
-                for approval_id, data in agent.pending_approvals.items():
-                    student_data = data["student_data"]
-                    log_msg(f"ID: {approval_id}")
-                    log_msg(f"  Student ID: {student_data.get('student_id', 'N/A')}")
-                    log_msg(f"  Student: {student_data.get('student_name', 'N/A')}")
-                    log_msg(f"  University: {student_data.get('university_name', 'N/A')}")
-                    log_msg(f"  Graduation Year: {student_data.get('graduation_year', 'N/A')}")
-                    log_msg("")
-                
+                log_msg("\nPending Approval Requests:\n" + agent.pending_listing())
+
                 approval_id = await prompt("Enter approval ID to approve: ")
                 comments = await prompt("Enter approval comments (optional): ")
-                
-                await agent.send_approval_response(approval_id, True, comments)
+
+                agent.queue_approval_response(approval_id, True, comments)
 
             elif option == "2":
                 # Reject credential request
@@ -489,37 +624,22 @@ async def main(args):
                     log_msg("No pending approval requests.")
                     continue
                 
-                log_msg("\nPending Approval Requests:")
-                for approval_id, data in agent.pending_approvals.items():
-                    student_data = data["student_data"]
-                    log_msg(f"ID: {approval_id}")
-                    log_msg(f"  Student ID: {student_data.get('student_id', 'N/A')}")
-                    log_msg(f"  Student: {student_data.get('student_name', 'N/A')}")
-                    log_msg(f"  University: {student_data.get('university_name', 'N/A')}")
-                    log_msg(f"  Graduation Year: {student_data.get('graduation_year', 'N/A')}")
-                    log_msg("")
-                
+                log_msg("\nPending Approval Requests:\n" + agent.pending_listing())
+
                 approval_id = await prompt("Enter approval ID to reject: ")
                 comments = await prompt("Enter rejection reason: ")
-                
-                await agent.send_approval_response(approval_id, False, comments)
+
+                agent.queue_approval_response(approval_id, False, comments)
 
             elif option == "3":
                 # List pending requests
                 if not agent.pending_approvals:
                     log_msg("No pending approval requests.")
                 else:
-                    log_msg("\n=== PENDING APPROVAL REQUESTS ===")
-                    for approval_id, data in agent.pending_approvals.items():
-                        student_data = data["student_data"]
-                        request_time = datetime.datetime.fromtimestamp(data["request_time"])
-                        log_msg(f"\nApproval ID: {approval_id}")
-                        log_msg(f"Request Time: {request_time}")
-                        log_msg(f"Student ID: {student_data.get('student_id', 'N/A')}")
-                        log_msg(f"Student Name: {student_data.get('student_name', 'N/A')}")
-                        log_msg(f"University: {student_data.get('university_name', 'N/A')}")
-                        log_msg(f"Graduation Year: {student_data.get('graduation_year', 'N/A')}")
-                        log_msg(f"CGPA: {student_data.get('cgpa', 'N/A')}")
+                    log_msg(
+                        "\n=== PENDING APPROVAL REQUESTS ===\n\n"
+                        + agent.pending_listing(verbose=True)
+                    )
 
             elif option == "4":
                 # Send message to registrar
@@ -550,23 +670,24 @@ async def main(args):
                     wait=False,
                 )
                 
-                # Generate clean, single-line JSON without extra whitespace
-                clean_invitation = json.dumps(invitation["invitation"], separators=(',', ':'))
-                
                 # Display in a way that's easy to copy
-                log_msg("\n" + "="*50)
-                log_msg("COPY THE FULL LINE BELOW FOR REGISTRAR:")
-                log_msg("="*50)
-                log_msg(clean_invitation)
-                log_msg("="*50)
-                log_msg("END OF INVITATION TO COPY")
-                log_msg("="*50 + "\n")
-                
+                _print_invitation(
+                    invitation, "COPY THE FULL LINE BELOW FOR REGISTRAR:", bar=_BAR50
+                )
+
                 # Also show the QR code for mobile connections
-                qr = QRCode(border=1)
-                qr.add_data(invitation["invitation_url"])
-                log_msg("QR Code for mobile wallets:")
-                qr.print_ascii(invert=True)
+                qr_ascii = await asyncio.get_event_loop().run_in_executor(
+                    None, _render_qr_ascii, invitation["invitation_url"]
+                )
+                log_msg("QR Code for mobile wallets:\n" + qr_ascii)
+
+        if agent._sender_task is not None:
+            # Let any still-queued approval responses go out before shutdown
+            try:
+                await asyncio.wait_for(agent._send_q.join(), timeout=5.0)
+            except asyncio.TimeoutError:
+                log_msg("Timed out waiting for queued approval responses")
+            agent._sender_task.cancel()
 
         if uni_admin_b_agent.show_timing:
             timing = await uni_admin_b_agent.agent.fetch_timing()
@@ -616,6 +737,15 @@ if __name__ == "__main__":
             print("pydevd_pycharm library was not found")
 
     try:
-        asyncio.get_event_loop().run_until_complete(main(args))
+        # The agent is almost entirely I/O-bound; uvloop speeds up selector
+        # wakeups and socket reads when installed, with no other changes
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
+    try:
+        asyncio.run(main(args))
     except KeyboardInterrupt:
         os._exit(1)
\ No newline at end of file
@@ -1,15 +1,24 @@
 #!/usr/bin/env python3
 import asyncio
 import datetime
+import functools
+import io
 import json
 import logging
 import os
+import socket
 import sys
 import time
 import uuid
-from aiohttp import ClientError
+from aiohttp import ClientError, ClientSession, TCPConnector
 from aiohttp import web
 from qrcode import QRCode
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from runners.agent_container import (  # noqa:E402
     AriesAgent,
@@ -34,7 +43,151 @@ DEMO_EXTRA_AGENT_ARGS = os.getenv("DEMO_EXTRA_AGENT_ARGS")
 logging.basicConfig(level=logging.WARNING)
 LOGGER = logging.getLogger(__name__)
 
+def _normalize_service_endpoint(service):
+    """Rewrite a localhost service endpoint for Docker bridge networking"""
+    endpoint = service.get("serviceEndpoint")
+    if not endpoint:
+        return
+    log_msg(f"Original endpoint: {endpoint}")
+
+    if "localhost" not in endpoint:
+        log_msg(f"Using endpoint as-is: {endpoint}")
+        return
+
+    # For Linux Docker, use the bridge gateway IP
+    docker_gateway = "172.17.0.1"  # Default Docker bridge gateway on Linux
+    docker_endpoint = endpoint.replace("localhost", docker_gateway)
+
+    # Also try container name as alternative
+    container_endpoint = endpoint.replace("localhost", "uni_admin_a")
+
+    service["serviceEndpoint"] = docker_endpoint
+    log_msg(f"Converted to Docker bridge endpoint: {docker_endpoint}")
+    log_msg(f"Alternative container endpoint: {container_endpoint}")
+    log_msg("(Both agents running in Docker containers)")
+
+    # Test connectivity to both options
+    endpoints_to_test = [
+        (docker_endpoint, "Docker bridge gateway"),
+        (container_endpoint, "Container name"),
+    ]
+
+    for test_endpoint, description in endpoints_to_test:
+        try:
+            host, port_str = (
+                test_endpoint.replace("http://", "").replace("https://", "").split(":")
+            )
+            port = int(port_str)
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(2)
+            result = sock.connect_ex((host, port))
+            sock.close()
+            if result == 0:
+                log_msg(f"✅ {description} endpoint {test_endpoint} is reachable")
+                service["serviceEndpoint"] = test_endpoint
+                break
+            else:
+                log_msg(f"❌ {description} endpoint {test_endpoint} is NOT reachable")
+        except Exception as e:
+            log_msg(f"❌ Could not test {description} endpoint: {e}")
+    else:
+        log_msg("⚠️  Using Docker bridge gateway endpoint (may still work)")
+        service["serviceEndpoint"] = docker_endpoint
+
+
+@functools.lru_cache(maxsize=8)
+def _render_qr_ascii(url):
+    """Render a QR code for url to an ASCII string (CPU-bound, run off-loop)
+
+    The matrix computation (Reed-Solomon ECC in pure Python) is identical
+    for identical URLs, so recent renders are memoized
+    """
+    qr = QRCode(border=1)
+    qr.add_data(url)
+    out = io.StringIO()
+    qr.print_ascii(out=out, invert=True)
+    return out.getvalue()
+
+
+def _loads(s):
+    """Parse a JSON string, using orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
+
+
+def _dumps(obj):
+    """Serialize to a compact JSON string, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+# Deletes \r and \n in a single C-level pass via str.translate
+_STRIP_NEWLINES = str.maketrans("", "", "\r\n")
+
+# Connection states that mean the peer is gone; frozenset for O(1)
+# membership on every connection event
+_GONE_STATES = frozenset({"abandoned", "deleted"})
+
+# Admin API path templates bound once instead of re-running f-string
+# interpolation at every call site
+_CONNECTION_PATH = "/connections/{}".format
+_SEND_MESSAGE_PATH = "/connections/{}/send-message".format
+_V2_RECORD_PATH = "/issue-credential-2.0/records/{}".format
+_V2_ISSUE_PATH = "/issue-credential-2.0/records/{}/issue".format
+
+# Fallback attributes used when no student data accompanies an offer
+_DEFAULT_CRED_ATTRS = {
+    "student_id": "ST12345",
+    "student_name": "John Doe",
+    "university_name": "Demo University",
+    "graduation_year": "2024",
+    "cgpa": "3.75",
+}
+
+# Static skeleton of the JSON-LD credential; the per-offer issuer and
+# credentialSubject are merged into a shallow copy instead of rebuilding
+# the whole nested structure on every call
+_JSONLD_CRED_TEMPLATE = {
+    "@context": [
+        "https://www.w3.org/2018/credentials/v1",
+        "https://w3id.org/citizenship/v1",
+        "https://w3id.org/security/bbs/v1",
+    ],
+    "type": [
+        "VerifiableCredential",
+        "UniversityStudent",
+    ],
+    "id": "https://credential.example.com/students/1234567890",
+    "issuanceDate": "2020-01-01T12:00:00Z",
+}
+
+class PendingCredential:
+    """A credential request awaiting admin approval
+
+    Hand-written with __slots__ rather than a dataclass: the slotted form
+    of @dataclass needs Python 3.10 and the repo pins 3.9, while adding a
+    manual __slots__ to a dataclass conflicts with its field defaults.
+    """
+
+    __slots__ = ("student_data", "request_time", "status", "response_time")
+
+    def __init__(
+        self, student_data, request_time, status="pending_approval", response_time=None
+    ):
+        self.student_data = student_data
+        self.request_time = request_time
+        self.status = status
+        self.response_time = response_time
+
+
 class UniRegAAgent(AriesAgent):
+    # Approval requests the admin never answers are purged after this many
+    # seconds; one repeating timer does the sweep for all entries
+    PENDING_TTL = 600
+    PENDING_SWEEP_INTERVAL = 60
+
     def __init__(
         self,
         ident: str,
@@ -63,10 +216,22 @@ class UniRegAAgent(AriesAgent):
             log_level=log_level,
             **kwargs,
         )
+        # The base class shares one ClientSession across all admin calls;
+        # swap it for one with keep-alive pooling tuned for the bursts of
+        # credential-exchange traffic this agent generates
+        old_session = self.client_session
+        self.client_session = ClientSession(
+            connector=TCPConnector(limit=100, keepalive_timeout=60)
+        )
+        asyncio.get_event_loop().create_task(old_session.close())
+
         self.connection_id = None  # Student/holder connection (for backward compatibility)
         self.holder_connection_id = None  # Explicitly track holder connection
         self._connection_ready = None
         self.admin_connection_id = None  # Admin connection for approvals
+        # Set by handle_connections when the admin connection goes active,
+        # so waiters can react to the webhook instead of polling
+        self._admin_ready = asyncio.Event()
         self.cred_state = {}
         self.cred_attrs = {}
         self.pending_credentials = {}  
@@ -77,6 +242,26 @@ class UniRegAAgent(AriesAgent):
         self.holder_connections = {}  # {connection_id: {label, connected_at, credentials_issued, status}}
         self.credential_exchanges = {}  # {cred_ex_id: connection_id}
 
+        self._sweep_handle = asyncio.get_event_loop().call_later(
+            self.PENDING_SWEEP_INTERVAL, self._sweep_pending
+        )
+
+    def _sweep_pending(self):
+        """Purge unanswered approval requests older than PENDING_TTL"""
+        cutoff = time.time() - self.PENDING_TTL
+        stale = [
+            approval_id
+            for approval_id, cred in self.pending_credentials.items()
+            if cred.status == "pending_approval" and cred.request_time < cutoff
+        ]
+        for approval_id in stale:
+            del self.pending_credentials[approval_id]
+            self.approval_responses.pop(approval_id, None)
+            LOGGER.debug("Expired pending credential request: %s", approval_id)
+        self._sweep_handle = asyncio.get_event_loop().call_later(
+            self.PENDING_SWEEP_INTERVAL, self._sweep_pending
+        )
+
     async def detect_connection(self):
         await self._connection_ready
         self._connection_ready = None
@@ -153,7 +338,7 @@ class UniRegAAgent(AriesAgent):
             self.remove_holder_connection(connection_id, "auto_cleanup")
             
             # Then delete the connection via admin API
-            await self.admin_DELETE(f"/connections/{connection_id}")
+            await self.admin_DELETE(_CONNECTION_PATH(connection_id))
             log_msg(f"✅ Successfully terminated connection: {connection_id}")
             
         except Exception as e:
@@ -212,16 +397,15 @@ class UniRegAAgent(AriesAgent):
         
         try:
             await self.admin_POST(
-                f"/connections/{self.admin_connection_id}/send-message",
-                {"content": json.dumps(request)}
+                _SEND_MESSAGE_PATH(self.admin_connection_id),
+                {"content": _dumps(request)}
             )
             
             # Store the pending request
-            self.pending_credentials[approval_id] = {
-                "student_data": student_data,
-                "request_time": time.time(),
-                "status": "pending_approval"
-            }
+            self.pending_credentials[approval_id] = PendingCredential(
+                student_data=student_data,
+                request_time=time.time(),
+            )
             
             log_msg(f"📤 Approval request sent to admin. Approval ID: {approval_id}")
             return approval_id
@@ -240,19 +424,19 @@ class UniRegAAgent(AriesAgent):
             if content:
                 # Try to parse content as JSON
                 try:
-                    content_json = json.loads(content)
+                    content_json = _loads(content)
                     if isinstance(content_json, dict) and content_json.get("type") == "credential_approval_response":
-                        log_msg("Received credential approval response via webhook")
+                        LOGGER.debug("Received credential approval response via webhook")
                         await self.handle_approval_response(payload)
                         return
-                except json.JSONDecodeError:
+                except ValueError:
                     pass
-                
+
                 # Handle as plain text message
                 log_msg(f"Received message from {connection_id}: {content}")
-                
-        except Exception as e:
-            log_msg(f"Error handling basicmessage webhook: {e}")
+
+        except Exception:
+            LOGGER.exception("Error handling basicmessage webhook")
 
     async def handle_connections(self, payload):
         """Handle connection state changes with multi-holder support"""
@@ -260,20 +444,25 @@ class UniRegAAgent(AriesAgent):
         state = payload.get("state")
         rfc23_state = payload.get("rfc23_state")
         
-        log_msg(f"Connection {conn_id} state: {state}")
-        
+        LOGGER.debug("Connection %s state: %s", conn_id, state)
+
         if state == "active" and conn_id:
-            log_msg(f"✅ Connection {conn_id} is now active")
-            
+            LOGGER.debug("Connection %s is now active", conn_id)
+
             try:
                 # Determine connection type based on context or labels
-                connection_info = await self.admin_GET(f"/connections/{conn_id}")
+                connection_info = await self.admin_GET(_CONNECTION_PATH(conn_id))
                 their_label = connection_info.get("their_label", "")
                 alias = connection_info.get("alias", "")
                 
                 # Check if this is an admin connection
-                if "admin" in their_label.lower() or "admin" in alias.lower():
+                if (
+                    "admin" in their_label.lower()
+                    or "admin" in alias.lower()
+                    or conn_id == self.admin_connection_id
+                ):
                     self.admin_connection_id = conn_id
+                    self._admin_ready.set()
                     log_msg(f"🔧 Admin connection established: {conn_id}")
                 else:
                     # This is a student/holder connection - add to multi-holder support
@@ -290,18 +479,18 @@ class UniRegAAgent(AriesAgent):
                 if not self.holder_connection_id:
                     self.holder_connection_id = conn_id
                     self.connection_id = conn_id
-                log_msg(f"Could not determine connection type, treating as holder: {e}")
+                LOGGER.debug("Could not determine connection type, treating as holder: %s", e)
         
-        elif state in ["abandoned", "deleted"] and conn_id:
+        elif state in _GONE_STATES and conn_id:
             # Connection was terminated
             if conn_id in self.holder_connections:
                 self.remove_holder_connection(conn_id, f"connection_{state}")
-            log_msg(f"🔌 Connection {conn_id} was {state}")
+            LOGGER.debug("Connection %s was %s", conn_id, state)
 
     async def handle_approval_response(self, message_data):
         """Handle approval response from admin"""
         try:
-            response = json.loads(message_data.get("content", "{}"))
+            response = _loads(message_data.get("content", "{}"))
             if response.get("type") == "credential_approval_response":
                 approval_id = response.get("approval_id")
                 approved = response.get("approved")
@@ -319,8 +508,9 @@ class UniRegAAgent(AriesAgent):
                     log_msg("=== Use option '6' to process approved credentials ===\n")
                     
                     # Update pending credential status
-                    self.pending_credentials[approval_id]["status"] = "approved" if approved else "rejected"
-                    self.pending_credentials[approval_id]["response_time"] = time.time()
+                    pending_cred = self.pending_credentials[approval_id]
+                    pending_cred.status = "approved" if approved else "rejected"
+                    pending_cred.response_time = time.time()
                     
         except Exception as e:
             log_msg(f"Error handling approval response: {e}")
@@ -334,16 +524,14 @@ class UniRegAAgent(AriesAgent):
         if cred_ex_id and connection_id:
             self.credential_exchanges[cred_ex_id] = connection_id
             
-        log_msg(f"🎫 Credential exchange {cred_ex_id}: {state}")
+        LOGGER.debug("Credential exchange %s: %s", cred_ex_id, state)
         
         # Handle request-received state (when holder accepts offer)
         if state == "request-received":
             log_status("#17 Issue credential to X")
             try:
                 # Get the credential exchange record to extract the credential preview
-                cred_ex_record = await self.admin_GET(
-                    f"/issue-credential-2.0/records/{cred_ex_id}"
-                )
+                cred_ex_record = await self.admin_GET(_V2_RECORD_PATH(cred_ex_id))
                 
                 # Try to extract credential preview from the offer
                 credential_preview = None
@@ -358,7 +546,7 @@ class UniRegAAgent(AriesAgent):
                     issue_request["credential_preview"] = credential_preview
                 
                 await self.admin_POST(
-                    f"/issue-credential-2.0/records/{cred_ex_id}/issue",
+                    _V2_ISSUE_PATH(cred_ex_id),
                     issue_request,
                 )
                 log_msg(f"🎫 Credential issued for exchange {cred_ex_id}")
@@ -366,7 +554,7 @@ class UniRegAAgent(AriesAgent):
                 log_msg(f"❌ Error during credential issuance: {e}")
                 # Fallback to basic issue request
                 await self.admin_POST(
-                    f"/issue-credential-2.0/records/{cred_ex_id}/issue",
+                    _V2_ISSUE_PATH(cred_ex_id),
                     {"comment": f"Issuing credential, exchange {cred_ex_id}"},
                 )
         
@@ -397,119 +585,75 @@ class UniRegAAgent(AriesAgent):
 
     async def process_approved_credential(self, approval_id):
         """Process an approved credential and issue it to student"""
-        if approval_id not in self.pending_credentials:
-            log_msg(f"No pending credential found for approval ID: {approval_id}")
-            return
-            
-        if approval_id not in self.approval_responses:
-            log_msg(f"No approval response found for approval ID: {approval_id}")
-            return
-            
-        approval_response = self.approval_responses[approval_id]
-        if not approval_response.get("approved"):
-            log_msg(f"Credential was not approved for approval ID: {approval_id}")
-            return
-
-        # Ensure we have a holder connection
-        holder_conn_id = self.get_holder_connection_id()
-        if not holder_conn_id:
-            log_msg("❌ No holder connection available. Cannot issue credential.")
-            return
-            
-        pending_cred = self.pending_credentials[approval_id]
-        student_data = pending_cred["student_data"]
-        
-        # Generate and send the credential offer
-        exchange_tracing = False  # You can make this configurable
-        
-        try:
-            # Use the credential generation logic with holder connection
-            offer_request = self.generate_credential_offer(
-                20,  # Assuming AIP 20
-                CRED_FORMAT_INDY,  # Assuming Indy format
-                self.cred_def_id,
-                exchange_tracing,
-                student_data=student_data,
-                holder_connection_id=holder_conn_id  # Pass holder connection explicitly
-            )
-            
-            await self.admin_POST(
-                "/issue-credential-2.0/send-offer", offer_request
-            )
-            
-            log_msg(f"✅ Credential offer sent to holder (Connection: {holder_conn_id}) for approval ID: {approval_id}")
-            
-            # Clean up processed credential
-            del self.pending_credentials[approval_id]
-            del self.approval_responses[approval_id]
-            
-        except Exception as e:
-            log_msg(f"❌ Error processing approved credential: {e}")
+        await self._issue_approved_credential(approval_id)
 
     async def process_approved_credential_for_holder(self, approval_id, target_conn_id):
         """Process an approved credential and issue it to a specific holder"""
+        await self._issue_approved_credential(approval_id, target_conn_id)
+
+    async def _issue_approved_credential(self, approval_id, target_conn_id=None):
+        """Shared validation and offer path for approved credentials"""
         if approval_id not in self.pending_credentials:
             log_msg(f"No pending credential found for approval ID: {approval_id}")
             return
-            
+
         if approval_id not in self.approval_responses:
             log_msg(f"No approval response found for approval ID: {approval_id}")
             return
-            
+
         approval_response = self.approval_responses[approval_id]
         if not approval_response.get("approved"):
             log_msg(f"Credential was not approved for approval ID: {approval_id}")
             return
 
-        # Validate the target connection exists and is active
-        active_holders = self.get_active_holders()
-        if target_conn_id not in active_holders:
-            log_msg(f"❌ Target holder connection {target_conn_id} is not active.")
-            return
-            
-        pending_cred = self.pending_credentials[approval_id]
-        student_data = pending_cred["student_data"]
-        
-        # Generate and send the credential offer to specific holder
+        if target_conn_id is None:
+            # Ensure we have a holder connection
+            target_conn_id = self.get_holder_connection_id()
+            if not target_conn_id:
+                log_msg("❌ No holder connection available. Cannot issue credential.")
+                return
+            holder_label = f"holder (Connection: {target_conn_id})"
+        else:
+            # Validate the target connection exists and is active
+            active_holders = self.get_active_holders()
+            if target_conn_id not in active_holders:
+                log_msg(f"❌ Target holder connection {target_conn_id} is not active.")
+                return
+            holder_info = active_holders[target_conn_id]
+            holder_label = f"{holder_info['label']} (Connection: {target_conn_id})"
+
+        student_data = self.pending_credentials[approval_id].student_data
+
+        # Generate and send the credential offer
         exchange_tracing = False  # You can make this configurable
-        
+
         try:
-            # Use the credential generation logic with specific holder connection
+            # Use the credential generation logic with the holder connection
             offer_request = self.generate_credential_offer(
                 20,  # Assuming AIP 20
                 CRED_FORMAT_INDY,  # Assuming Indy format
                 self.cred_def_id,
                 exchange_tracing,
                 student_data=student_data,
-                holder_connection_id=target_conn_id  # Pass specific holder connection
+                holder_connection_id=target_conn_id
             )
-            
+
             await self.admin_POST(
                 "/issue-credential-2.0/send-offer", offer_request
             )
-            
-            holder_info = active_holders[target_conn_id]
-            log_msg(f"✅ Credential offer sent to {holder_info['label']} (Connection: {target_conn_id}) for approval ID: {approval_id}")
-            
+
+            log_msg(f"✅ Credential offer sent to {holder_label} for approval ID: {approval_id}")
+
             # Clean up processed credential
             del self.pending_credentials[approval_id]
             del self.approval_responses[approval_id]
-            
+
         except Exception as e:
-            log_msg(f"❌ Error processing approved credential for specific holder: {e}")
+            log_msg(f"❌ Error processing approved credential: {e}")
 
     def generate_credential_offer(self, aip, cred_type, cred_def_id, exchange_tracing, student_data=None, holder_connection_id=None):
         # Use provided student data or default values
-        if student_data:
-            cred_attrs = student_data
-        else:
-            cred_attrs = {
-                "student_id": "ST12345",
-                "student_name": "John Doe",
-                "university_name": "Demo University",
-                "graduation_year": "2024",
-                "cgpa": "3.75",
-            }
+        cred_attrs = student_data or _DEFAULT_CRED_ATTRS
 
         # Determine which connection to use for credential issuance
         target_connection_id = holder_connection_id or self.get_holder_connection_id()
@@ -557,27 +701,19 @@ class UniRegAAgent(AriesAgent):
                         }
                 return offer_request
             elif cred_type == CRED_FORMAT_JSON_LD:
-                # Use student data in JSON-LD credential
-                given_name = cred_attrs.get("student_name", "JOHN").split()[0].upper()
-                family_name = cred_attrs.get("student_name", "DOE").split()[-1].upper()
+                # Use student data in JSON-LD credential; look up and split
+                # the name once rather than per field
+                name_parts = cred_attrs.get("student_name", "John Doe").split()
+                given_name = name_parts[0].upper()
+                family_name = name_parts[-1].upper()
                 
                 offer_request = {
                     "connection_id": target_connection_id,  # Use holder connection
                     "filter": {
                         "ld_proof": {
                             "credential": {
-                                "@context": [
-                                    "https://www.w3.org/2018/credentials/v1",
-                                    "https://w3id.org/citizenship/v1",
-                                    "https://w3id.org/security/bbs/v1",
-                                ],
-                                "type": [
-                                    "VerifiableCredential",
-                                    "UniversityStudent",
-                                ],
-                                "id": "https://credential.example.com/students/1234567890",
+                                **_JSONLD_CRED_TEMPLATE,
                                 "issuer": self.did,
-                                "issuanceDate": "2020-01-01T12:00:00Z",
                                 "credentialSubject": {
                                     "type": ["UniversityStudent"],
                                     "givenName": given_name,
@@ -789,7 +925,7 @@ class UniRegAAgent(AriesAgent):
 async def main(args):
     extra_args = None
     if DEMO_EXTRA_AGENT_ARGS:
-        extra_args = json.loads(DEMO_EXTRA_AGENT_ARGS)
+        extra_args = _loads(DEMO_EXTRA_AGENT_ARGS)
         print("Got extra args:", extra_args)
     # Fix Docker networking - when running in Docker containers, set correct endpoint
     import os
@@ -1053,19 +1189,23 @@ async def main(args):
                         )
                     ) + f"/pres_req/{pres_req_id}/"
                     log_msg(f"Proof request url: {url}")
-                    qr = QRCode(border=1)
-                    qr.add_data(url)
+                    # QR generation is CPU-bound; render it in the default
+                    # executor so the event loop keeps servicing webhooks
+                    qr_ascii = await asyncio.get_event_loop().run_in_executor(
+                        None, _render_qr_ascii, url
+                    )
                     log_msg(
-                        "Scan the following QR code to accept the proof request from a mobile agent."
+                        "Scan the following QR code to accept the proof request "
+                        "from a mobile agent.\n" + qr_ascii
                     )
-                    qr.print_ascii(invert=True)
                 else:
                     raise Exception(f"Error invalid AIP level: {uni_reg_a_agent.aip}")
             elif option == "3":
                 msg = await prompt("Enter message: ")
-                if agent.get_holder_connection_id():
+                holder_conn_id = agent.get_holder_connection_id()
+                if holder_conn_id:
                     await agent.admin_POST(
-                        f"/connections/{agent.get_holder_connection_id()}/send-message",
+                        _SEND_MESSAGE_PATH(holder_conn_id),
                         {"content": msg},
                     )
                 else:
@@ -1089,79 +1229,47 @@ async def main(args):
                 log_msg("Paste the admin invitation JSON and press Enter:")
                 
                 invitation_json = await prompt("")
-                invitation_json = invitation_json.strip().replace("\n", "").replace("\r", "")
+                invitation_json = invitation_json.translate(_STRIP_NEWLINES).strip()
                 try:
                     # Parse and validate the invitation
-                    invitation = json.loads(invitation_json)
+                    invitation = _loads(invitation_json)
                     
-                    log_msg(f"Received invitation: {json.dumps(invitation, indent=2)}")
-                    
-                    # Handle Docker container networking
-                    if "services" in invitation and len(invitation["services"]) > 0:
-                        service = invitation["services"][0]
-                        if "serviceEndpoint" in service:
-                            endpoint = service["serviceEndpoint"]
-                            log_msg(f"Original endpoint: {endpoint}")
-                            
-                            # When running in Docker containers via run_demo, convert localhost appropriately
-                            if "localhost" in endpoint:
-                                # For Linux Docker, use the bridge gateway IP
-                                docker_gateway = "172.17.0.1"  # Default Docker bridge gateway on Linux
-                                docker_endpoint = endpoint.replace("localhost", docker_gateway)
-                                
-                                # Also try container name as alternative
-                                container_endpoint = endpoint.replace("localhost", "uni_admin_a")
-                                
-                                service["serviceEndpoint"] = docker_endpoint
-                                log_msg(f"Converted to Docker bridge endpoint: {docker_endpoint}")
-                                log_msg(f"Alternative container endpoint: {container_endpoint}")
-                                log_msg("(Both agents running in Docker containers)")
-                                
-                                # Test connectivity to both options
-                                import socket
-                                endpoints_to_test = [
-                                    (docker_endpoint, "Docker bridge gateway"),
-                                    (container_endpoint, "Container name")
-                                ]
-                                
-                                for test_endpoint, description in endpoints_to_test:
-                                    try:
-                                        host, port_str = test_endpoint.replace("http://", "").replace("https://", "").split(":")
-                                        port = int(port_str)
-                                        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                                        sock.settimeout(2)
-                                        result = sock.connect_ex((host, port))
-                                        sock.close()
-                                        if result == 0:
-                                            log_msg(f"✅ {description} endpoint {test_endpoint} is reachable")
-                                            service["serviceEndpoint"] = test_endpoint
-                                            break
-                                        else:
-                                            log_msg(f"❌ {description} endpoint {test_endpoint} is NOT reachable")
-                                    except Exception as e:
-                                        log_msg(f"❌ Could not test {description} endpoint: {e}")
-                                else:
-                                    log_msg("⚠️  Using Docker bridge gateway endpoint (may still work)")
-                                    service["serviceEndpoint"] = docker_endpoint
-                            else:
-                                log_msg(f"Using endpoint as-is: {endpoint}")
+                    LOGGER.debug("Received invitation: %s", invitation)
                     
+                    # Handle Docker container networking: normalize the
+                    # did-communication service (or the first one) in place
+                    services = invitation.get("services") or []
+                    service = next(
+                        (
+                            s
+                            for s in services
+                            if isinstance(s, dict)
+                            and s.get("type") == "did-communication"
+                        ),
+                        None,
+                    )
+                    if service is None and services and isinstance(services[0], dict):
+                        service = services[0]
+                    if service is not None:
+                        _normalize_service_endpoint(service)
+
                     # Use out-of-band invitation handling
+                    agent._admin_ready.clear()
                     response = await agent.admin_POST("/out-of-band/receive-invitation", invitation)
-                    
+
                     agent.admin_connection_id = response["connection_id"]
                     log_msg(f"✅ Connected to admin agent: {agent.admin_connection_id}")
-                    
-                    # Verify connection state
-                    await asyncio.sleep(2)
+
+                    # Wait for the connection webhook instead of sleeping and
+                    # polling the admin API for the state
                     try:
-                        connection = await agent.admin_GET(f"/connections/{agent.admin_connection_id}")
-                        log_msg(f"Connection state: {connection.get('state', 'unknown')}")
+                        await asyncio.wait_for(agent._admin_ready.wait(), timeout=10)
+                        log_msg("Connection state: active")
                         log_msg("You can now use option 1 to request credential approvals")
-                    except Exception as e:
-                        log_msg(f"Could not verify connection state: {e}")
+                    except asyncio.TimeoutError:
+                        log_msg("Connection not active yet; it may still complete in the background")
                     
-                except json.JSONDecodeError as e:
+                except ValueError as e:
                     log_msg(f"❌ Invalid JSON format: {str(e)}")
                 except KeyError as e:
                     log_msg(f"❌ Missing expected key: {str(e)}")
@@ -1191,8 +1299,7 @@ async def main(args):
                 
                 log_msg("\n=== APPROVED CREDENTIALS ===")
                 for i, approval_id in enumerate(approved_credentials, 1):
-                    pending_cred = agent.pending_credentials[approval_id]
-                    student_data = pending_cred["student_data"]
+                    student_data = agent.pending_credentials[approval_id].student_data
                     log_msg(f"  {i}. {approval_id}: {student_data.get('student_name')} - {student_data.get('university_name')}")
                 
                 cred_choice = await prompt("Enter credential number to process: ")
@@ -1231,9 +1338,9 @@ async def main(args):
                 else:
                     log_msg("\n=== PENDING APPROVAL REQUESTS ===")
                     for approval_id, data in agent.pending_credentials.items():
-                        student_data = data["student_data"]
-                        status = data["status"]
-                        request_time = datetime.datetime.fromtimestamp(data["request_time"])
+                        student_data = data.student_data
+                        status = data.status
+                        request_time = datetime.datetime.fromtimestamp(data.request_time)
                         log_msg(f"\nApproval ID: {approval_id}")
                         log_msg(f"Status: {status}")
                         log_msg(f"Request Time: {request_time}")
@@ -1374,6 +1481,8 @@ async def main(args):
                     )
                 except ClientError:
                     pass
+        agent._sweep_handle.cancel()
+
         if uni_reg_a_agent.show_timing:
             timing = await agent.fetch_timing()
             if timing: